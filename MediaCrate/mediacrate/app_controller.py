@@ -4,6 +4,7 @@ import uuid
 import webbrowser
 import glob
 from collections import deque
+from dataclasses import replace
 from datetime import datetime, timezone
 import os
 from pathlib import Path
@@ -146,9 +147,12 @@ class AppController(QObject):
     def __init__(self, app) -> None:
         super().__init__()
         self.app = app
-        self.config: AppConfig = load_config()
-        self.config.background_worker_threads = self._coerce_background_worker_threads(
-            self.config.background_worker_threads
+        loaded_config = load_config()
+        self.config: AppConfig = replace(
+            loaded_config,
+            background_worker_threads=self._coerce_background_worker_threads(
+                loaded_config.background_worker_threads
+            ),
         )
 
         icon_path = resolve_app_asset("icon.ico")
@@ -336,6 +340,7 @@ class AppController(QObject):
             ("restore-batch-queue", queue_restore_gap, self._run_startup_stage_restore_queue),
             ("download-history", history_gap, self._run_startup_stage_history),
             ("stale-part-cleanup", 0, self._run_startup_stage_stale_cleanup),
+            ("update-recovery", 0, self._run_startup_stage_update_recovery),
         ]
         if self.config.auto_check_updates:
             update_gap = max(0, AUTO_UPDATE_START_DELAY_MS - STARTUP_STAGE_HISTORY_DELAY_MS)
@@ -367,6 +372,9 @@ class AppController(QObject):
     def _run_startup_stage_stale_cleanup(self) -> None:
         self._request_stale_part_cleanup(reason="startup")
 
+    def _run_startup_stage_update_recovery(self) -> None:
+        self.update_service.start_background_recovery()
+
     def _run_startup_stage_auto_update(self) -> None:
         self.start_update_check(manual=False)
 
@@ -451,11 +459,10 @@ class AppController(QObject):
 
     def _flush_config_save(self) -> None:
         try:
-            self.config.window_geometry = (
-                self.window.saveGeometry().toBase64().data().decode("ascii")
-            )
+            window_geometry = self.window.saveGeometry().toBase64().data().decode("ascii")
         except Exception:
-            self.config.window_geometry = ""
+            window_geometry = ""
+        self.config = replace(self.config, window_geometry=window_geometry)
         payload = config_to_dict(self.config)
         if (not self._config_dirty) and self._last_saved_config_payload is not None:
             if payload == self._last_saved_config_payload:
@@ -1027,6 +1034,9 @@ class AppController(QObject):
         cancel_metadata_workers = getattr(service, "cancel_metadata_workers", None)
         if callable(cancel_metadata_workers):
             cancel_metadata_workers()
+        close_service = getattr(service, "close", None)
+        if callable(close_service):
+            close_service()
 
     def _running_worker_threads(self) -> list[QThread]:
         candidates: list[QThread] = []
@@ -1411,23 +1421,26 @@ class AppController(QObject):
 
     def _on_theme_mode_changed(self, mode: str) -> None:
         normalized = "light" if str(mode).strip().lower() == "light" else "dark"
-        self.config.theme_mode = normalized
+        self.config = replace(self.config, theme_mode=normalized)
         self.window.set_theme(get_theme(normalized), normalized)
         self._save_config()
 
     def _on_ui_scale_changed(self, value: int) -> None:
-        self.config.ui_scale_percent = int(value)
+        self.config = replace(self.config, ui_scale_percent=int(value))
         self._save_config()
 
     def _on_download_location_changed(self, path: str) -> None:
         candidate = str(path or "").strip()
         if not candidate:
             return
-        self.config.download_location = candidate
+        self.config = replace(self.config, download_location=candidate)
         self._save_config()
 
     def _on_batch_concurrency_changed(self, value: int) -> None:
-        self.config.batch_concurrency = max(1, min(BATCH_CONCURRENCY_MAX, int(value)))
+        self.config = replace(
+            self.config,
+            batch_concurrency=max(1, min(BATCH_CONCURRENCY_MAX, int(value))),
+        )
         self._save_config(deferred=True)
 
     @staticmethod
@@ -1440,7 +1453,7 @@ class AppController(QObject):
 
     def _apply_background_worker_threads(self, value: object, *, save: bool) -> None:
         normalized = self._coerce_background_worker_threads(value)
-        self.config.background_worker_threads = normalized
+        self.config = replace(self.config, background_worker_threads=normalized)
         self._batch_analysis_max_workers = normalized
         self._thumbnail_flow.set_max_workers(normalized)
         self._pump_batch_analysis_queue()
@@ -1451,7 +1464,7 @@ class AppController(QObject):
         self._apply_background_worker_threads(value, save=True)
 
     def _on_batch_mode_changed(self, value: bool) -> None:
-        self.config.batch_enabled = bool(value)
+        self.config = replace(self.config, batch_enabled=bool(value))
         self._save_config()
         if bool(value):
             self._stop_single_selection_size_worker()
@@ -1466,11 +1479,11 @@ class AppController(QObject):
             self._apply_metadata_fetch_policy()
 
     def _on_skip_existing_files_changed(self, value: bool) -> None:
-        self.config.skip_existing_files = bool(value)
+        self.config = replace(self.config, skip_existing_files=bool(value))
         self._save_config()
 
     def _on_auto_start_ready_links_changed(self, value: bool) -> None:
-        self.config.auto_start_ready_links = bool(value)
+        self.config = replace(self.config, auto_start_ready_links=bool(value))
         self._save_config()
         if (not self.config.auto_start_ready_links) or (not self._is_download_running()) or (not self._active_download_is_multi):
             return
@@ -1481,7 +1494,7 @@ class AppController(QObject):
         self._enqueue_entries_into_active_download(deduped_candidates, source_label="auto-start")
 
     def _on_batch_retry_count_changed(self, value: int) -> None:
-        self.config.batch_retry_count = max(0, min(3, int(value)))
+        self.config = replace(self.config, batch_retry_count=max(0, min(3, int(value))))
         self._save_config(deferred=True)
 
     def _on_retry_profile_changed(self, value: str) -> None:
@@ -1489,17 +1502,17 @@ class AppController(QObject):
         valid_profiles = {item.value for item in RetryProfile}
         if requested not in valid_profiles:
             requested = RetryProfile.BASIC.value
-        self.config.retry_profile = requested
         if requested == RetryProfile.OFF.value:
-            self.config.batch_retry_count = 0
+            retry_count = 0
         elif requested == RetryProfile.AGGRESSIVE.value:
-            self.config.batch_retry_count = 3
+            retry_count = 3
         else:
-            self.config.batch_retry_count = 1
+            retry_count = 1
+        self.config = replace(self.config, retry_profile=requested, batch_retry_count=retry_count)
         self._save_config(deferred=True)
 
     def _on_fallback_metadata_changed(self, value: bool) -> None:
-        self.config.fallback_download_on_metadata_error = bool(value)
+        self.config = replace(self.config, fallback_download_on_metadata_error=bool(value))
         self._save_config()
         if self._is_metadata_fallback_enabled():
             self._apply_metadata_fallback_policy_to_batch_entries()
@@ -1507,7 +1520,7 @@ class AppController(QObject):
         self._reconcile_disabled_metadata_fallback_entries()
 
     def _on_accurate_size_changed(self, value: bool) -> None:
-        self.config.accurate_size_enabled = bool(value)
+        self.config = replace(self.config, accurate_size_enabled=bool(value))
         self._save_config(deferred=True)
         if not self._is_accurate_size_enabled():
             self._stop_single_selection_size_worker()
@@ -1523,21 +1536,24 @@ class AppController(QObject):
         self._refresh_batch_entries_view()
 
     def _on_save_metadata_to_file_changed(self, value: bool) -> None:
-        self.config.save_metadata_to_file = bool(value)
+        self.config = replace(self.config, save_metadata_to_file=bool(value))
         self._save_config(deferred=True)
 
     def _on_retain_format_selection_changed(self, value: bool) -> None:
-        self.config.retain_format_selection_enabled = bool(value)
+        self.config = replace(self.config, retain_format_selection_enabled=bool(value))
         if not self._is_retain_format_selection_enabled():
-            self.config.saved_format_choice = "VIDEO"
-            self.config.saved_quality_choice = "BEST QUALITY"
+            self.config = replace(
+                self.config,
+                saved_format_choice="VIDEO",
+                saved_quality_choice="BEST QUALITY",
+            )
             self._pending_saved_format_choice = None
             self._pending_saved_quality_choice = None
         self._save_config(deferred=True)
 
     def _on_filename_template_changed(self, value: str) -> None:
         template = str(value or "").strip()
-        self.config.filename_template = template or DEFAULT_FILENAME_TEMPLATE
+        self.config = replace(self.config, filename_template=template or DEFAULT_FILENAME_TEMPLATE)
         self._save_config()
 
     @staticmethod
@@ -1551,35 +1567,37 @@ class AppController(QObject):
         policy = str(value or "skip").strip().lower()
         if policy not in {"skip", "rename", "overwrite"}:
             policy = "skip"
-        self.config.conflict_policy = policy
-        self.config.skip_existing_files = policy == "skip"
+        self.config = replace(self.config, conflict_policy=policy, skip_existing_files=policy == "skip")
         self._save_config()
 
     def _on_speed_limit_changed(self, value: int) -> None:
-        self.config.download_speed_limit_kbps = max(0, min(SPEED_LIMIT_KBPS_MAX, int(value)))
+        self.config = replace(
+            self.config,
+            download_speed_limit_kbps=max(0, min(SPEED_LIMIT_KBPS_MAX, int(value))),
+        )
         self._save_config(deferred=True)
 
     def _on_adaptive_concurrency_changed(self, value: bool) -> None:
         del value
-        self.config.adaptive_batch_concurrency = True
+        self.config = replace(self.config, adaptive_batch_concurrency=True)
         self._save_config()
 
     def _on_auto_updates_changed(self, value: bool) -> None:
-        self.config.auto_check_updates = bool(value)
+        self.config = replace(self.config, auto_check_updates=bool(value))
         self._save_config()
 
     def _on_metadata_fetch_disabled_changed(self, value: bool) -> None:
-        self.config.disable_metadata_fetch = bool(value)
+        self.config = replace(self.config, disable_metadata_fetch=bool(value))
         self._save_config()
         self._apply_metadata_fetch_policy()
 
     def _on_disable_history_changed(self, value: bool) -> None:
-        self.config.disable_history = bool(value)
+        self.config = replace(self.config, disable_history=bool(value))
         self._save_config()
         self._apply_history_policy(show_feedback=True)
 
     def _on_stale_part_cleanup_hours_changed(self, value: int) -> None:
-        self.config.stale_part_cleanup_hours = max(0, min(24 * 30, int(value)))
+        self.config = replace(self.config, stale_part_cleanup_hours=max(0, min(24 * 30, int(value))))
         self._save_config(deferred=True)
         if not self._is_download_running():
             self._request_stale_part_cleanup(reason="settings")
@@ -1595,9 +1613,7 @@ class AppController(QObject):
         )
         if answer != QMessageBox.Yes:
             return
-        defaults = default_config()
-        defaults.window_geometry = self.config.window_geometry
-        self.config = defaults
+        self.config = replace(default_config(), window_geometry=self.config.window_geometry)
         self._pending_saved_format_choice = None
         self._pending_saved_quality_choice = None
         self.window.set_theme(get_theme(self.config.theme_mode), self.config.theme_mode)
@@ -2119,8 +2135,11 @@ class AppController(QObject):
         ).strip().upper() or "BEST QUALITY"
         if is_audio_format_choice(format_choice):
             quality_choice = "BEST QUALITY"
-        self.config.saved_format_choice = format_choice
-        self.config.saved_quality_choice = quality_choice
+        self.config = replace(
+            self.config,
+            saved_format_choice=format_choice,
+            saved_quality_choice=quality_choice,
+        )
         self._pending_saved_format_choice = None
         self._pending_saved_quality_choice = None
 
@@ -4285,6 +4304,7 @@ class AppController(QObject):
         self._probe_pending_show_errors = False
 
     def _refresh_dependency_status(self) -> None:
+        self.download_service.refresh_ffmpeg_path()
         status = dependency_status()
         self.window.set_dependency_state("ffmpeg", status["ffmpeg"].installed, status["ffmpeg"].path)
         self.window.set_dependency_state("node", status["node"].installed, status["node"].path)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Iterator
+from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
 
 from .models import AppConfig, RetryProfile
@@ -20,9 +23,10 @@ UPDATE_SOURCEFORGE_RSS_URL = "https://sourceforge.net/projects/mediacrate/rss?pa
 
 CONFIG_FILENAME = "MediaCrate_config.json"
 LEGACY_CONFIG_FILENAMES = ("MediaCrate_config_v2.json",)
+LEGACY_SCAN_MARKER_FILENAME = ".mc_legacy_scanned"
 CONFIG_SCHEMA_VERSION = 10
 
-THEME_VALUES = {"dark", "light"}
+THEME_VALUES = frozenset({"dark", "light"})
 UI_SCALE_MIN = 75
 UI_SCALE_MAX = 200
 UI_SCALE_STEP = 5
@@ -37,9 +41,11 @@ SPEED_LIMIT_KBPS_MAX = 100000
 LEGACY_UNLIMITED_SPEED_SENTINEL_KBPS = 50000
 STALE_PART_CLEANUP_HOURS_MIN = 0
 STALE_PART_CLEANUP_HOURS_MAX = 24 * 30
-CONFLICT_VALUES = {"skip", "rename", "overwrite"}
-RETRY_PROFILE_VALUES = {item.value for item in RetryProfile}
+CONFLICT_VALUES = frozenset({"skip", "rename", "overwrite"})
+RETRY_PROFILE_VALUES = frozenset(item.value for item in RetryProfile)
 DEFAULT_FILENAME_TEMPLATE = "%(title).130B [%(mc_quality)s] [%(id)s].%(ext)s"
+_TRUE_LITERALS = frozenset({"true", "1", "yes", "on"})
+_FALSE_LITERALS = frozenset({"false", "0", "no", "off"})
 
 
 def _paths():
@@ -67,9 +73,9 @@ def _coerce_bool(value: object, *, default: bool) -> bool:
         return value
     if isinstance(value, str):
         lowered = value.strip().lower()
-        if lowered in {"true", "1", "yes", "on"}:
+        if lowered in _TRUE_LITERALS:
             return True
-        if lowered in {"false", "0", "no", "off"}:
+        if lowered in _FALSE_LITERALS:
             return False
     return default
 
@@ -86,6 +92,21 @@ def _coerce_non_empty_text(value: object, *, default: str) -> str:
     return text if text else str(default)
 
 
+def _normalize_choice(
+    value: object,
+    allowed: frozenset[str] | None,
+    default: str,
+    *,
+    upper: bool = False,
+) -> str:
+    text = str(value or "").strip()
+    text = text.upper() if upper else text.lower()
+    if not text or (allowed is not None and text not in allowed):
+        return default
+    return text
+
+
+@lru_cache(maxsize=1)
 def _default_background_worker_threads() -> int:
     cpu_count = os.cpu_count() or 4
     return max(BACKGROUND_WORKER_THREADS_MIN, min(BACKGROUND_WORKER_THREADS_MAX, int(cpu_count)))
@@ -125,58 +146,57 @@ def default_config(paths_provider=None) -> AppConfig:
 
 def _sanitize_payload(payload: dict[str, object], paths_provider=None) -> AppConfig:
     defaults = default_config(paths_provider=paths_provider)
-    payload_schema = _coerce_int(payload.get("schema_version", 0), 0, 0, CONFIG_SCHEMA_VERSION)
-
-    theme_mode = str(payload.get("theme_mode", defaults.theme_mode)).strip().lower()
-    if theme_mode not in THEME_VALUES:
-        theme_mode = defaults.theme_mode
-    download_location = _coerce_non_empty_text(
-        payload.get("download_location", defaults.download_location),
+    get = payload.get
+    coerce_int = _coerce_int
+    coerce_bool = _coerce_bool
+    coerce_text = _coerce_non_empty_text
+    normalize_choice = _normalize_choice
+    payload_schema = coerce_int(get("schema_version", 0), 0, 0, CONFIG_SCHEMA_VERSION)
+
+    theme_mode = normalize_choice(get("theme_mode"), THEME_VALUES, defaults.theme_mode)
+    download_location = coerce_text(
+        get("download_location", defaults.download_location),
         default=defaults.download_location,
     )
-    filename_template = _coerce_non_empty_text(
-        payload.get("filename_template", defaults.filename_template),
+    filename_template = coerce_text(
+        get("filename_template", defaults.filename_template),
         default=defaults.filename_template,
     )
-    conflict_policy = str(payload.get("conflict_policy", defaults.conflict_policy) or "").strip().lower()
-    if conflict_policy not in CONFLICT_VALUES:
-        conflict_policy = defaults.conflict_policy
-    retry_profile = str(payload.get("retry_profile", defaults.retry_profile) or "").strip().lower()
-    if retry_profile not in RETRY_PROFILE_VALUES:
-        retry_profile = defaults.retry_profile
-    saved_format_choice = _coerce_non_empty_text(
-        payload.get("saved_format_choice", defaults.saved_format_choice),
-        default=defaults.saved_format_choice,
+    conflict_policy = normalize_choice(
+        get("conflict_policy"), CONFLICT_VALUES, defaults.conflict_policy
     )
-    saved_quality_choice = _coerce_non_empty_text(
-        payload.get("saved_quality_choice", defaults.saved_quality_choice),
-        default=defaults.saved_quality_choice,
+    retry_profile = normalize_choice(get("retry_profile"), RETRY_PROFILE_VALUES, defaults.retry_profile)
+    saved_format_choice = normalize_choice(
+        get("saved_format_choice"), None, defaults.saved_format_choice, upper=True
+    )
+    saved_quality_choice = normalize_choice(
+        get("saved_quality_choice"), None, defaults.saved_quality_choice, upper=True
     )
 
     return AppConfig(
         schema_version=CONFIG_SCHEMA_VERSION,
         theme_mode=theme_mode,
         ui_scale_percent=_coerce_ui_scale(
-            payload.get("ui_scale_percent", defaults.ui_scale_percent),
+            get("ui_scale_percent", defaults.ui_scale_percent),
             defaults.ui_scale_percent,
         ),
         download_location=download_location,
-        batch_enabled=_coerce_bool(payload.get("batch_enabled"), default=defaults.batch_enabled),
-        batch_concurrency=_coerce_int(
-            payload.get("batch_concurrency", defaults.batch_concurrency),
+        batch_enabled=coerce_bool(get("batch_enabled"), default=defaults.batch_enabled),
+        batch_concurrency=coerce_int(
+            get("batch_concurrency", defaults.batch_concurrency),
             defaults.batch_concurrency,
             BATCH_CONCURRENCY_MIN,
             BATCH_CONCURRENCY_MAX,
         ),
-        skip_existing_files=_coerce_bool(
-            payload.get("skip_existing_files"), default=defaults.skip_existing_files
+        skip_existing_files=coerce_bool(
+            get("skip_existing_files"), default=defaults.skip_existing_files
         ),
-        auto_start_ready_links=_coerce_bool(
-            payload.get("auto_start_ready_links"),
+        auto_start_ready_links=coerce_bool(
+            get("auto_start_ready_links"),
             default=defaults.auto_start_ready_links,
         ),
-        batch_retry_count=_coerce_int(
-            payload.get("batch_retry_count", defaults.batch_retry_count),
+        batch_retry_count=coerce_int(
+            get("batch_retry_count", defaults.batch_retry_count),
             defaults.batch_retry_count,
             BATCH_RETRY_COUNT_MIN,
             BATCH_RETRY_COUNT_MAX,
@@ -184,53 +204,53 @@ def _sanitize_payload(payload: dict[str, object], paths_provider=None) -> AppCon
         filename_template=filename_template,
         conflict_policy=conflict_policy,
         download_speed_limit_kbps=_sanitize_speed_limit_kbps(
-            payload.get("download_speed_limit_kbps", defaults.download_speed_limit_kbps),
+            get("download_speed_limit_kbps", defaults.download_speed_limit_kbps),
             schema_version=payload_schema,
             default=defaults.download_speed_limit_kbps,
         ),
-        adaptive_batch_concurrency=_coerce_bool(
-            payload.get("adaptive_batch_concurrency"),
+        adaptive_batch_concurrency=coerce_bool(
+            get("adaptive_batch_concurrency"),
             default=defaults.adaptive_batch_concurrency,
         ),
-        auto_check_updates=_coerce_bool(
-            payload.get("auto_check_updates"), default=defaults.auto_check_updates
+        auto_check_updates=coerce_bool(
+            get("auto_check_updates"), default=defaults.auto_check_updates
         ),
-        background_worker_threads=_coerce_int(
-            payload.get("background_worker_threads", defaults.background_worker_threads),
+        background_worker_threads=coerce_int(
+            get("background_worker_threads", defaults.background_worker_threads),
             defaults.background_worker_threads,
             BACKGROUND_WORKER_THREADS_MIN,
             BACKGROUND_WORKER_THREADS_MAX,
         ),
-        window_geometry=str(payload.get("window_geometry", defaults.window_geometry) or ""),
-        disable_metadata_fetch=_coerce_bool(
-            payload.get("disable_metadata_fetch"),
+        window_geometry=str(get("window_geometry", defaults.window_geometry) or ""),
+        disable_metadata_fetch=coerce_bool(
+            get("disable_metadata_fetch"),
             default=defaults.disable_metadata_fetch,
         ),
-        disable_history=_coerce_bool(
-            payload.get("disable_history"),
+        disable_history=coerce_bool(
+            get("disable_history"),
             default=defaults.disable_history,
         ),
         retry_profile=retry_profile,
-        fallback_download_on_metadata_error=_coerce_bool(
-            payload.get("fallback_download_on_metadata_error"),
+        fallback_download_on_metadata_error=coerce_bool(
+            get("fallback_download_on_metadata_error"),
             default=defaults.fallback_download_on_metadata_error,
         ),
-        accurate_size_enabled=_coerce_bool(
-            payload.get("accurate_size_enabled"),
+        accurate_size_enabled=coerce_bool(
+            get("accurate_size_enabled"),
             default=defaults.accurate_size_enabled,
         ),
-        save_metadata_to_file=_coerce_bool(
-            payload.get("save_metadata_to_file"),
+        save_metadata_to_file=coerce_bool(
+            get("save_metadata_to_file"),
             default=defaults.save_metadata_to_file,
         ),
-        retain_format_selection_enabled=_coerce_bool(
-            payload.get("retain_format_selection_enabled"),
+        retain_format_selection_enabled=coerce_bool(
+            get("retain_format_selection_enabled"),
             default=defaults.retain_format_selection_enabled,
         ),
-        saved_format_choice=str(saved_format_choice).strip().upper() or "VIDEO",
-        saved_quality_choice=str(saved_quality_choice).strip().upper() or "BEST QUALITY",
-        stale_part_cleanup_hours=_coerce_int(
-            payload.get("stale_part_cleanup_hours", defaults.stale_part_cleanup_hours),
+        saved_format_choice=saved_format_choice,
+        saved_quality_choice=saved_quality_choice,
+        stale_part_cleanup_hours=coerce_int(
+            get("stale_part_cleanup_hours", defaults.stale_part_cleanup_hours),
             defaults.stale_part_cleanup_hours,
             STALE_PART_CLEANUP_HOURS_MIN,
             STALE_PART_CLEANUP_HOURS_MAX,
@@ -243,23 +263,38 @@ def config_path(paths_provider=None) -> Path:
     return paths_module.runtime_storage_dir() / CONFIG_FILENAME
 
 
-def _legacy_config_candidates(paths_provider=None) -> list[Path]:
-    candidates: list[Path] = []
-    seen: set[Path] = set()
+def _legacy_config_candidates(paths_provider=None) -> Iterator[Path]:
+    seen: set[str] = set()
     paths_module = paths_provider or _paths()
-    bases = [
-        paths_module.runtime_storage_dir(),
-        paths_module.app_dir(),
-        paths_module.appdata_dir(),
-    ]
-    for base in bases:
+    bases = (
+        paths_module.runtime_storage_dir,
+        paths_module.app_dir,
+        paths_module.appdata_dir,
+    )
+    for base_provider in bases:
+        base = base_provider()
         for filename in LEGACY_CONFIG_FILENAMES:
             path = base / filename
-            if path in seen:
+            key = os.fspath(path)
+            if key in seen:
                 continue
-            seen.add(path)
-            candidates.append(path)
-    return candidates
+            seen.add(key)
+            yield path
+
+
+def _list_file_names(directory: Path) -> frozenset[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+
+
+def _mark_legacy_scan_done(primary: Path) -> None:
+    try:
+        (primary.parent / LEGACY_SCAN_MARKER_FILENAME).touch()
+    except OSError:
+        pass
 
 
 def _load_config_from_path(path: Path, paths_provider=None) -> AppConfig | None:
@@ -274,13 +309,24 @@ def _load_config_from_path(path: Path, paths_provider=None) -> AppConfig | None:
 
 def load_config(paths_provider=None) -> AppConfig:
     primary = config_path(paths_provider=paths_provider)
-    if primary.exists():
+    primary_dir_files = _list_file_names(primary.parent)
+    if primary.name in primary_dir_files:
         loaded = _load_config_from_path(primary, paths_provider=paths_provider)
         if loaded is not None:
+            if LEGACY_SCAN_MARKER_FILENAME not in primary_dir_files:
+                _mark_legacy_scan_done(primary)
             return loaded
 
+    if LEGACY_SCAN_MARKER_FILENAME in primary_dir_files:
+        return default_config(paths_provider=paths_provider)
+    listed_dirs: dict[str, frozenset[str]] = {os.fspath(primary.parent): primary_dir_files}
     for legacy in _legacy_config_candidates(paths_provider=paths_provider):
-        if not legacy.exists():
+        parent_key = os.fspath(legacy.parent)
+        dir_files = listed_dirs.get(parent_key)
+        if dir_files is None:
+            dir_files = _list_file_names(legacy.parent)
+            listed_dirs[parent_key] = dir_files
+        if legacy.name not in dir_files:
             continue
         loaded = _load_config_from_path(legacy, paths_provider=paths_provider)
         if loaded is None:
@@ -291,34 +337,22 @@ def load_config(paths_provider=None) -> AppConfig:
 
 
 def config_to_dict(config: AppConfig) -> dict[str, object]:
-    return {
-        "schema_version": CONFIG_SCHEMA_VERSION,
-        "theme_mode": config.theme_mode,
-        "ui_scale_percent": int(config.ui_scale_percent),
-        "download_location": str(config.download_location),
-        "batch_enabled": bool(config.batch_enabled),
-        "batch_concurrency": int(config.batch_concurrency),
-        "skip_existing_files": bool(config.skip_existing_files),
-        "auto_start_ready_links": bool(config.auto_start_ready_links),
-        "batch_retry_count": int(config.batch_retry_count),
-        "filename_template": str(config.filename_template or DEFAULT_FILENAME_TEMPLATE),
-        "conflict_policy": str(config.conflict_policy or "skip"),
-        "download_speed_limit_kbps": int(config.download_speed_limit_kbps),
-        "adaptive_batch_concurrency": bool(config.adaptive_batch_concurrency),
-        "auto_check_updates": bool(config.auto_check_updates),
-        "background_worker_threads": int(config.background_worker_threads),
-        "window_geometry": str(config.window_geometry or ""),
-        "disable_metadata_fetch": bool(config.disable_metadata_fetch),
-        "disable_history": bool(config.disable_history),
-        "retry_profile": str(config.retry_profile or RetryProfile.BASIC.value),
-        "fallback_download_on_metadata_error": bool(config.fallback_download_on_metadata_error),
-        "accurate_size_enabled": bool(config.accurate_size_enabled),
-        "save_metadata_to_file": bool(config.save_metadata_to_file),
-        "retain_format_selection_enabled": bool(config.retain_format_selection_enabled),
-        "saved_format_choice": str(config.saved_format_choice or "VIDEO"),
-        "saved_quality_choice": str(config.saved_quality_choice or "BEST QUALITY"),
-        "stale_part_cleanup_hours": int(config.stale_part_cleanup_hours),
-    }
+    payload = asdict(config)
+    payload["schema_version"] = CONFIG_SCHEMA_VERSION
+    payload["filename_template"] = payload["filename_template"] or DEFAULT_FILENAME_TEMPLATE
+    payload["conflict_policy"] = payload["conflict_policy"] or "skip"
+    payload["retry_profile"] = payload["retry_profile"] or RetryProfile.BASIC.value
+    payload["window_geometry"] = payload["window_geometry"] or ""
+    payload["saved_format_choice"] = payload["saved_format_choice"] or "VIDEO"
+    payload["saved_quality_choice"] = payload["saved_quality_choice"] or "BEST QUALITY"
+    return payload
+
+
+def _config_file_matches(path: Path, serialized: bytes) -> bool:
+    try:
+        return path.read_bytes() == serialized
+    except OSError:
+        return False
 
 
 def save_config(config: AppConfig, paths_provider=None) -> str | None:
@@ -326,8 +360,11 @@ def save_config(config: AppConfig, paths_provider=None) -> str | None:
     path = config_path(paths_provider=paths_provider)
     tmp_path = path.with_suffix(f"{path.suffix}.tmp")
     try:
+        serialized = json.dumps(payload, indent=2).encode("utf-8")
+        if _config_file_matches(path, serialized):
+            return str(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp_path.write_bytes(serialized)
         os.replace(str(tmp_path), str(path))
         return str(path)
     except (OSError, TypeError, ValueError):
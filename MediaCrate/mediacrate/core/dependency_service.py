@@ -250,23 +250,11 @@ def _find_binaries_under(path: Path, binary_names: tuple[str, ...]) -> dict[str,
     return found
 
 
-def _sha256_file(path: Path, cancel_token, dependency_name: str) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        while True:
-            _ensure_not_cancelled(cancel_token, dependency_name)
-            chunk = handle.read(COPY_CHUNK_SIZE)
-            if not chunk:
-                break
-            digest.update(chunk)
-    return digest.hexdigest().lower()
-
-
-def _verify_archive_hash(path: Path, *, expected_sha256: str, cancel_token, dependency_name: str) -> None:
+def _verify_archive_digest(actual_sha256: str, *, expected_sha256: str, dependency_name: str) -> None:
     expected = str(expected_sha256 or "").strip().lower()
     if len(expected) != 64:
         raise RuntimeError(f"{dependency_name} dependency manifest has no valid SHA256.")
-    actual = _sha256_file(path, cancel_token, dependency_name)
+    actual = str(actual_sha256 or "").strip().lower()
     if actual != expected:
         raise RuntimeError(
             f"{dependency_name} archive SHA256 mismatch. Expected {expected}, got {actual}."
@@ -294,6 +282,18 @@ def _safe_member_target(extract_root: Path, member: ZipInfo) -> Path:
     return target
 
 
+def _select_needed_members(members: list[ZipInfo], binary_names: tuple[str, ...]) -> list[ZipInfo]:
+    wanted = {str(name or "").strip().lower() for name in binary_names if str(name or "").strip()}
+    selected: list[ZipInfo] = []
+    for member in members:
+        if member.is_dir():
+            continue
+        member_name = str(member.filename or "").replace("\\", "/").rsplit("/", 1)[-1].lower()
+        if member_name in wanted or member_name.endswith(".dll"):
+            selected.append(member)
+    return selected
+
+
 def _safe_extract_zip(
     zipped: ZipFile,
     extract_dir: Path,
@@ -302,6 +302,7 @@ def _safe_extract_zip(
     cancel_token,
     max_members: int,
     max_extract_bytes: int,
+    binary_names: tuple[str, ...] | None = None,
     progress_cb: Callable[[int, str], None] | None = None,
 ) -> None:
     members = zipped.infolist()
@@ -314,6 +315,10 @@ def _safe_extract_zip(
         if total_extract_bytes > max_extract_bytes:
             raise RuntimeError(f"{dependency_name} archive is larger than the allowed extraction limit.")
 
+    if binary_names:
+        members = _select_needed_members(members, binary_names)
+        total_extract_bytes = sum(max(0, int(member.file_size or 0)) for member in members)
+
     extracted_bytes = 0
     for member in members:
         _ensure_not_cancelled(cancel_token, dependency_name)
@@ -376,6 +381,7 @@ class DependencyService:
                 if total > max_download_bytes:
                     raise RuntimeError(f"{name} archive is larger than the allowed download limit.")
                 done = 0
+                archive_digest = hashlib.sha256()
                 with archive_path.open("wb") as handle:
                     for chunk in response.iter_content(chunk_size=1024 * 256):
                         _ensure_not_cancelled(cancel_token, name)
@@ -383,6 +389,7 @@ class DependencyService:
                         if not chunk:
                             continue
                         handle.write(chunk)
+                        archive_digest.update(chunk)
                         done += len(chunk)
                         if done > max_download_bytes:
                             raise RuntimeError(f"{name} archive exceeded the allowed download limit.")
@@ -394,10 +401,9 @@ class DependencyService:
 
             if progress_cb:
                 progress_cb(72, f"Verifying {name} archive")
-            _verify_archive_hash(
-                archive_path,
+            _verify_archive_digest(
+                archive_digest.hexdigest(),
                 expected_sha256=package.sha256,
-                cancel_token=cancel_token,
                 dependency_name=name,
             )
             if log_cb:
@@ -415,6 +421,7 @@ class DependencyService:
                     cancel_token=cancel_token,
                     max_members=package.max_members,
                     max_extract_bytes=package.max_extract_bytes,
+                    binary_names=package.binaries,
                     progress_cb=progress_cb,
                 )
 
@@ -3,25 +3,29 @@ from __future__ import annotations
 import argparse
 import concurrent.futures
 import contextlib
+import copy
 import dataclasses
 import json
 import math
 import os
-import queue
 import random
 import re
+import selectors
+import signal
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-from collections import deque
-from collections.abc import Callable
+import weakref
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+from urllib.parse import ParseResult, quote_plus, unquote_plus, urlparse, urlunparse
 from typing import Any
 
-from .config import DEFAULT_FILENAME_TEMPLATE
+from .config import BATCH_CONCURRENCY_MAX, DEFAULT_FILENAME_TEMPLATE
 from .node_runtime import NODE_MIN_MAJOR_VERSION, is_supported_node_runtime
 from .models import (
     DownloadJob,
@@ -41,8 +45,6 @@ from .formatting import format_size_human as _format_size_human
 from .partial_files import discard_partial_candidates, record_partial_candidates
 from .paths import resolve_binary
 
-_PROGRESS_RE = re.compile(r"(?P<percent>\d+(?:\.\d+)?)%")
-_DOWNLOAD_LINE_TOTAL_RE = re.compile(r"\bof\s+(?P<size>\d+(?:\.\d+)?)\s*(?P<unit>[KMGTPE]?i?B|[KMGTPE]?B)\b", re.IGNORECASE)
 SingleProgressCallback = Callable[[float, str], None]
 BatchProgressCallback = Callable[[str, float, str], None]
 StatusCallback = Callable[[str, str], None]
@@ -65,21 +67,29 @@ _POST_PROCESSING_LINE_TOKENS = (
     "deleting original file",
 )
 _ANSI_ESCAPE_RE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
-_CONTROL_CHAR_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
-
-_TRACKING_QUERY_KEYS = {
-    "feature",
-    "si",
-    "spm",
-    "source",
-    "fbclid",
-    "gclid",
-    "igshid",
-    "ref",
-    "ref_src",
-    "tracking_id",
-    "trk",
+_ERROR_TEXT_TRANSLATION = {
+    **dict.fromkeys((*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F)),
+    ord("\r"): "\n",
 }
+_BLANK_LINE_RUN_RE = re.compile(r"\n{3,}")
+
+_TRACKING_QUERY_KEYS = frozenset(
+    {
+        "feature",
+        "si",
+        "spm",
+        "source",
+        "fbclid",
+        "gclid",
+        "igshid",
+        "ref",
+        "ref_src",
+        "tracking_id",
+        "trk",
+    }
+)
+
+_PLAIN_QUERY_PAIR_RE = re.compile(r"[A-Za-z0-9_.~-]+=[A-Za-z0-9_.~-]*")
 
 _RETRYABLE_ERROR_TOKENS = (
     "temporary",
@@ -120,6 +130,54 @@ _FORMAT_UNAVAILABLE_ERROR_TOKENS = (
     "no such format",
 )
 
+
+def _token_search_re(tokens: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(re.escape(token) for token in tokens))
+
+
+_IMPORTANT_LOG_RE = _token_search_re(_IMPORTANT_LOG_TOKENS)
+_POST_PROCESSING_LINE_RE = _token_search_re(_POST_PROCESSING_LINE_TOKENS)
+_RETRYABLE_ERROR_RE = _token_search_re(_RETRYABLE_ERROR_TOKENS)
+_NON_RETRYABLE_ERROR_RE = _token_search_re(_NON_RETRYABLE_ERROR_TOKENS)
+_FORMAT_UNAVAILABLE_ERROR_RE = _token_search_re(_FORMAT_UNAVAILABLE_ERROR_TOKENS)
+
+_BUILTIN_FORMAT_CHOICES = frozenset(
+    {
+        FormatChoice.VIDEO.value,
+        FormatChoice.AUDIO.value,
+        FormatChoice.MP4.value,
+        FormatChoice.MP3.value,
+    }
+)
+_STATE_CANCELLED = DownloadState.CANCELLED.value
+_STATE_DONE = DownloadState.DONE.value
+_STATE_DOWNLOADING = DownloadState.DOWNLOADING.value
+_STATE_ERROR = DownloadState.ERROR.value
+_STATE_PAUSED = DownloadState.PAUSED.value
+_STATE_QUEUED = DownloadState.QUEUED.value
+_STATE_RETRYING = DownloadState.RETRYING.value
+_STATE_SKIPPED = DownloadState.SKIPPED.value
+_DOWNLOAD_STATE_VALUES = {state.value: state.value for state in DownloadState}
+_AUDIO_CHOICE = FormatChoice.AUDIO.value
+_MP3_CHOICE = FormatChoice.MP3.value
+_MP4_CHOICE = FormatChoice.MP4.value
+_UNFIXED_EXTENSION_CHOICES = frozenset({FormatChoice.VIDEO.value, FormatChoice.AUDIO.value})
+_EMPTY_POST_ARGS: tuple[str, ...] = ()
+_MP3_POST_ARGS = ("--extract-audio", "--audio-format", "mp3", "--audio-quality", "0")
+_MP4_POST_ARGS = ("--merge-output-format", "mp4")
+_SORTED_CONVERSION_CONTAINERS = tuple(sorted(set(CONVERSION_CONTAINER_ORDER)))
+_BASE_INPROCESS_YDL_OPTS: dict[str, Any] = {
+    "newline": True,
+    "noplaylist": True,
+    "no_warnings": True,
+    "quiet": True,
+}
+_MP3_POSTPROCESSOR: dict[str, Any] = {
+    "key": "FFmpegExtractAudio",
+    "preferredcodec": "mp3",
+    "preferredquality": "0",
+}
+_METADATA_POSTPROCESSOR: dict[str, Any] = {"key": "FFmpegMetadata"}
 _CONFLICT_POLICY_VALUES = {"skip", "rename", "overwrite"}
 _DEFAULT_OUTPUT_TEMPLATE = DEFAULT_FILENAME_TEMPLATE
 _INPROCESS_CANCELLED_SENTINEL = "__MEDIACRATE_CANCELLED__"
@@ -129,7 +187,26 @@ _YTDLP_BINARY_ENV = "MEDIACRATE_YTDLP_BINARY"
 _METADATA_WORKER_ENV = "MEDIACRATE_METADATA_WORKER"
 _METADATA_MODE_ENV = "MEDIACRATE_METADATA_MODE"
 _METADATA_WORKER_GRACE_SECONDS = 1.5
+_PIPE_READ_CHUNK_BYTES = 64 * 1024
+_PIPE_IDLE_POLL_SECONDS = 0.2
+_PROCESS_TERMINATE_GRACE_SECONDS = 1.0
+_PROGRESS_EMIT_INTERVAL_SECONDS = 0.1
+_PROGRESS_TEMPLATE_PREFIX = "[mediacrate-progress]"
+_PROGRESS_TEMPLATE_FIELDS = (
+    "downloaded_bytes",
+    "total_bytes",
+    "total_bytes_estimate",
+    "fragment_index",
+    "fragment_count",
+)
+_PROGRESS_TEMPLATE = "download:" + " ".join(
+    (_PROGRESS_TEMPLATE_PREFIX, *(f"%(progress.{field})s" for field in _PROGRESS_TEMPLATE_FIELDS))
+)
 _METADATA_STDERR_TAIL_BYTES = 16 * 1024
+_METADATA_CACHE_TTL_SECONDS = 300.0
+_METADATA_CACHE_MAX_ENTRIES = 256
+_METADATA_YDL_IDLE_LIMIT = 4
+_METADATA_YDL_POOL_MAX_KEYS = 8
 _SIZE_ESTIMATE_DEFAULT_KEY = "__DEFAULT__"
 _MC_QUALITY_TOKEN_RE = re.compile(r"%\((_?mc_quality)\)[^%a-zA-Z]*[a-zA-Z]", re.IGNORECASE)
 _QUALITY_BRACKET_TOKEN_RE = re.compile(r"\[quality\]", re.IGNORECASE)
@@ -172,6 +249,7 @@ def _extract_expected_size_bytes(info: dict[str, object]) -> int | None:
     return best_size
 
 
+@lru_cache(maxsize=256)
 def _selection_size_key(format_choice: str, quality_choice: str) -> str:
     normalized_format = str(format_choice or FormatChoice.VIDEO.value).strip().upper() or FormatChoice.VIDEO.value
     if is_audio_format_choice(normalized_format):
@@ -187,16 +265,15 @@ def _size_from_format_item(fmt: dict[str, object], *, duration_seconds: int | No
         return int(direct)
     if not isinstance(duration_seconds, int) or duration_seconds <= 0:
         return None
-    bitrate_kbps = None
-    for key in ("tbr", "vbr", "abr"):
-        raw = fmt.get(key)
-        if isinstance(raw, (int, float)) and float(raw) > 0:
-            candidate = float(raw)
-            if bitrate_kbps is None or candidate > bitrate_kbps:
-                bitrate_kbps = candidate
-    if bitrate_kbps is None:
-        return None
-    estimated = _estimate_size_from_bitrate(duration_seconds, bitrate_kbps)
+    bitrate_kbps = max(
+        (
+            float(raw)
+            for raw in (fmt.get("tbr"), fmt.get("vbr"), fmt.get("abr"))
+            if isinstance(raw, (int, float)) and raw > 0
+        ),
+        default=0.0,
+    )
+    estimated = int(bitrate_kbps * 125.0 * float(duration_seconds))
     return estimated if estimated > 0 else None
 
 
@@ -219,14 +296,9 @@ def _sum_size_from_format_items(
     for item in formats:
         if not isinstance(item, dict):
             continue
-        direct = item.get("filesize") or item.get("filesize_approx")
-        if isinstance(direct, (int, float)) and int(direct) > 0:
-            total += int(direct)
-            found = True
-            continue
-        estimate = _size_from_format_item(item, duration_seconds=duration_seconds)
-        if isinstance(estimate, int) and estimate > 0:
-            total += int(estimate)
+        size = _size_from_format_item(item, duration_seconds=duration_seconds)
+        if size is not None:
+            total += size
             found = True
     return total if found else None
 
@@ -243,31 +315,63 @@ def _requested_format_items(info_dict: dict[str, object]) -> list[dict[str, obje
     return []
 
 
-def _enrich_format_sizes(
+def _lc(mapping: dict[str, object], key: str) -> str:
+    value = mapping.get(key)
+    return value.strip().lower() if isinstance(value, str) else ""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _FormatSizeTable:
+    sizes: tuple[int, ...]
+    heights: tuple[int, ...]
+    exts: tuple[str, ...]
+    has_video: tuple[bool, ...]
+    has_audio: tuple[bool, ...]
+
+
+def _build_format_size_table(
     formats: list[dict[str, object]],
     *,
     duration_seconds: int | None,
-) -> list[dict[str, object]]:
-    enriched: list[dict[str, object]] = []
+) -> _FormatSizeTable:
+    sizes: list[int] = []
+    heights: list[int] = []
+    exts: list[str] = []
+    has_video: list[bool] = []
+    has_audio: list[bool] = []
     for item in formats:
         if not isinstance(item, dict):
             continue
-        updated = dict(item)
-        updated["_size_estimate"] = _size_from_format_item(item, duration_seconds=duration_seconds)
-        enriched.append(updated)
-    return enriched
+        size = _size_from_format_item(item, duration_seconds=duration_seconds)
+        if not isinstance(size, int) or size <= 0:
+            continue
+        vcodec = _lc(item, "vcodec")
+        acodec = _lc(item, "acodec")
+        height = item.get("height")
+        sizes.append(size)
+        heights.append(height if type(height) is int and height >= 0 else _normalize_height(height))
+        exts.append(_lc(item, "ext"))
+        has_video.append(bool(vcodec) and vcodec != "none")
+        has_audio.append(bool(acodec) and acodec != "none")
+    return _FormatSizeTable(
+        sizes=tuple(sizes),
+        heights=tuple(heights),
+        exts=tuple(exts),
+        has_video=tuple(has_video),
+        has_audio=tuple(has_audio),
+    )
 
 
 def _estimate_mp3_size(
-    formats: list[dict[str, object]],
+    table: _FormatSizeTable,
     *,
     duration_seconds: int | None,
 ) -> int | None:
     target_bitrate_kbps = 245.0  # Approximate V0 average used by --audio-quality 0
     target_estimate = _estimate_size_from_bitrate(duration_seconds, target_bitrate_kbps)
     if target_estimate is None:
-        return _best_audio_size(formats)
-    source_size = _best_audio_size(formats)
+        return _best_audio_size(table)
+    source_size = _best_audio_size(table)
     if source_size is None:
         return target_estimate
     source_bitrate_kbps = (float(source_size) * 8.0) / (float(duration_seconds) * 1000.0)
@@ -284,49 +388,45 @@ def _normalize_height(value: object) -> int:
     return 0
 
 
-def _best_audio_size(formats: list[dict[str, object]], *, preferred_ext: str = "") -> int | None:
+def _best_audio_size(table: _FormatSizeTable, *, preferred_ext: str = "") -> int | None:
     requested_ext = str(preferred_ext or "").strip().lower()
     best = None
     fallback = None
-    for item in formats:
-        acodec = str(item.get("acodec") or "").strip().lower()
-        if not acodec or acodec == "none":
-            continue
-        value = item.get("_size_estimate")
-        if not isinstance(value, int) or value <= 0:
+    for size_value, ext, has_audio in zip(table.sizes, table.exts, table.has_audio):
+        if not has_audio:
             continue
-        ext = str(item.get("ext") or "").strip().lower()
         if requested_ext and ext == requested_ext:
-            if best is None or value > best:
-                best = value
+            if best is None or size_value > best:
+                best = size_value
             continue
-        if fallback is None or value > fallback:
-            fallback = value
+        if fallback is None or size_value > fallback:
+            fallback = size_value
     if best is not None:
         return best
     return fallback
 
 
-def _best_video_size(
-    formats: list[dict[str, object]],
+def _best_ranked_video_size(
+    table: _FormatSizeTable,
     *,
     max_height: int | None,
-    preferred_ext: str = "",
+    preferred_ext: str,
+    require_audio: bool,
 ) -> int | None:
     requested_ext = str(preferred_ext or "").strip().lower()
     best_tuple = None
     fallback_tuple = None
-    for item in formats:
-        vcodec = str(item.get("vcodec") or "").strip().lower()
-        if not vcodec or vcodec == "none":
-            continue
-        size_value = item.get("_size_estimate")
-        if not isinstance(size_value, int) or size_value <= 0:
+    for size_value, height, ext, has_video, has_audio in zip(
+        table.sizes,
+        table.heights,
+        table.exts,
+        table.has_video,
+        table.has_audio,
+    ):
+        if not has_video or (require_audio and not has_audio):
             continue
-        height = _normalize_height(item.get("height"))
         if max_height is not None and height > max_height:
             continue
-        ext = str(item.get("ext") or "").strip().lower()
         rank = (height, size_value)
         if requested_ext and ext == requested_ext:
             if best_tuple is None or rank > best_tuple:
@@ -341,65 +441,38 @@ def _best_video_size(
     return None
 
 
-def _best_progressive_size(
-    formats: list[dict[str, object]],
+def _best_video_size(
+    table: _FormatSizeTable,
     *,
     max_height: int | None,
     preferred_ext: str = "",
 ) -> int | None:
-    requested_ext = str(preferred_ext or "").strip().lower()
-    best_tuple = None
-    fallback_tuple = None
-    for item in formats:
-        vcodec = str(item.get("vcodec") or "").strip().lower()
-        acodec = str(item.get("acodec") or "").strip().lower()
-        if (not vcodec) or vcodec == "none" or (not acodec) or acodec == "none":
-            continue
-        size_value = item.get("_size_estimate")
-        if not isinstance(size_value, int) or size_value <= 0:
-            continue
-        height = _normalize_height(item.get("height"))
-        if max_height is not None and height > max_height:
-            continue
-        ext = str(item.get("ext") or "").strip().lower()
-        rank = (height, size_value)
-        if requested_ext and ext == requested_ext:
-            if best_tuple is None or rank > best_tuple:
-                best_tuple = rank
-            continue
-        if fallback_tuple is None or rank > fallback_tuple:
-            fallback_tuple = rank
-    if best_tuple is not None:
-        return int(best_tuple[1])
-    if fallback_tuple is not None:
-        return int(fallback_tuple[1])
-    return None
+    return _best_ranked_video_size(table, max_height=max_height, preferred_ext=preferred_ext, require_audio=False)
 
 
-def _estimate_selection_size_bytes_from_info(
-    info_dict: dict[str, object],
+def _best_progressive_size(
+    table: _FormatSizeTable,
     *,
-    format_choice: str,
-    quality_choice: str,
+    max_height: int | None,
+    preferred_ext: str = "",
 ) -> int | None:
-    if not isinstance(info_dict, dict):
-        return None
-    formats_raw = info_dict.get("formats")
-    if not isinstance(formats_raw, list) or not formats_raw:
-        return _extract_expected_size_bytes(info_dict)
+    return _best_ranked_video_size(table, max_height=max_height, preferred_ext=preferred_ext, require_audio=True)
 
-    duration_seconds = _extract_duration_seconds(info_dict)
-    formats: list[dict[str, object]] = []
-    for item in formats_raw:
-        if not isinstance(item, dict):
-            continue
-        enriched = dict(item)
-        enriched["_size_estimate"] = _size_from_format_item(item, duration_seconds=duration_seconds)
-        formats.append(enriched)
 
-    if not formats:
-        return _extract_expected_size_bytes(info_dict)
+def _has_format_items(info_dict: dict[str, object]) -> bool:
+    formats_raw = info_dict.get("formats")
+    if not isinstance(formats_raw, list):
+        return False
+    return any(isinstance(item, dict) for item in formats_raw)
 
+
+def _estimate_selection_size_from_table(
+    table: _FormatSizeTable,
+    *,
+    format_choice: str,
+    quality_choice: str,
+    duration_seconds: int | None,
+) -> int | None:
     choice = str(format_choice or FormatChoice.VIDEO.value).strip().upper() or FormatChoice.VIDEO.value
     height_limit = _quality_height(quality_choice)
 
@@ -408,39 +481,58 @@ def _estimate_selection_size_bytes_from_info(
         if choice not in {FormatChoice.AUDIO.value, FormatChoice.MP3.value}:
             preferred_ext = choice.lower()
         if choice == FormatChoice.MP3.value:
-            return _estimate_mp3_size(formats, duration_seconds=duration_seconds)
-        return _best_audio_size(formats, preferred_ext=preferred_ext)
+            return _estimate_mp3_size(table, duration_seconds=duration_seconds)
+        return _best_audio_size(table, preferred_ext=preferred_ext)
 
-    audio_size = _best_audio_size(formats)
+    audio_size = _best_audio_size(table)
 
     if choice == FormatChoice.MP4.value:
-        video_size = _best_video_size(formats, max_height=height_limit, preferred_ext="mp4")
-        m4a_size = _best_audio_size(formats, preferred_ext="m4a")
+        video_size = _best_video_size(table, max_height=height_limit, preferred_ext="mp4")
+        m4a_size = _best_audio_size(table, preferred_ext="m4a")
         if video_size is not None and m4a_size is not None:
             return int(video_size + m4a_size)
-        progressive_mp4 = _best_progressive_size(formats, max_height=height_limit, preferred_ext="mp4")
+        progressive_mp4 = _best_progressive_size(table, max_height=height_limit, preferred_ext="mp4")
         if progressive_mp4 is not None:
             return progressive_mp4
         if video_size is not None and audio_size is not None:
             return int(video_size + audio_size)
-        return _best_progressive_size(formats, max_height=height_limit)
+        return _best_progressive_size(table, max_height=height_limit)
 
     if choice == FormatChoice.VIDEO.value or choice in CONVERSION_CONTAINER_CHOICES:
-        video_size = _best_video_size(formats, max_height=height_limit)
+        video_size = _best_video_size(table, max_height=height_limit)
         if video_size is not None and audio_size is not None:
             return int(video_size + audio_size)
-        return _best_progressive_size(formats, max_height=height_limit)
+        return _best_progressive_size(table, max_height=height_limit)
 
     requested_ext = choice.lower()
-    custom_video_size = _best_video_size(formats, max_height=height_limit, preferred_ext=requested_ext)
+    custom_video_size = _best_video_size(table, max_height=height_limit, preferred_ext=requested_ext)
     if custom_video_size is not None and audio_size is not None:
         return int(custom_video_size + audio_size)
-    custom_progressive = _best_progressive_size(formats, max_height=height_limit, preferred_ext=requested_ext)
+    custom_progressive = _best_progressive_size(table, max_height=height_limit, preferred_ext=requested_ext)
     if custom_progressive is not None:
         return custom_progressive
     if custom_video_size is not None:
         return custom_video_size
-    return _best_progressive_size(formats, max_height=height_limit)
+    return _best_progressive_size(table, max_height=height_limit)
+
+
+def _estimate_selection_size_bytes_from_info(
+    info_dict: dict[str, object],
+    *,
+    format_choice: str,
+    quality_choice: str,
+) -> int | None:
+    if not isinstance(info_dict, dict):
+        return None
+    if not _has_format_items(info_dict):
+        return _extract_expected_size_bytes(info_dict)
+    duration_seconds = _extract_duration_seconds(info_dict)
+    return _estimate_selection_size_from_table(
+        _build_format_size_table(info_dict["formats"], duration_seconds=duration_seconds),
+        format_choice=format_choice,
+        quality_choice=quality_choice,
+        duration_seconds=duration_seconds,
+    )
 
 
 def _build_selection_size_estimates(
@@ -472,22 +564,30 @@ def _build_selection_size_estimates(
         seen_qualities.add(value)
         normalized_qualities.append(value)
 
+    table = None
+    duration_seconds = None
+    if isinstance(info_dict, dict) and _has_format_items(info_dict):
+        duration_seconds = _extract_duration_seconds(info_dict)
+        table = _build_format_size_table(info_dict["formats"], duration_seconds=duration_seconds)
+
+    def estimate_for(fmt: str, quality: str) -> int | None:
+        if table is None:
+            return default_size
+        return _estimate_selection_size_from_table(
+            table,
+            format_choice=fmt,
+            quality_choice=quality,
+            duration_seconds=duration_seconds,
+        )
+
     for fmt in normalized_formats:
         if is_audio_format_choice(fmt):
-            estimate = _estimate_selection_size_bytes_from_info(
-                info_dict,
-                format_choice=fmt,
-                quality_choice="BEST QUALITY",
-            )
+            estimate = estimate_for(fmt, "BEST QUALITY")
             if estimate is not None:
                 estimates[_selection_size_key(fmt, "BEST QUALITY")] = int(estimate)
             continue
         for quality in normalized_qualities:
-            estimate = _estimate_selection_size_bytes_from_info(
-                info_dict,
-                format_choice=fmt,
-                quality_choice=quality,
-            )
+            estimate = estimate_for(fmt, quality)
             if estimate is None:
                 continue
             estimates[_selection_size_key(fmt, quality)] = int(estimate)
@@ -539,7 +639,7 @@ def _extract_duration_seconds(info: dict[str, object]) -> int | None:
 
 def _extract_source_label(info: dict[str, object], fallback_url: str) -> str:
     if isinstance(info, dict):
-        explicit_domain = str(info.get("webpage_url_domain") or "").strip().lower()
+        explicit_domain = _lc(info, "webpage_url_domain")
         if explicit_domain:
             return explicit_domain
         for key in ("webpage_url", "original_url"):
@@ -594,26 +694,38 @@ def coerce_http_url(url: str) -> str:
     return candidate
 
 
-def validate_url(url: str) -> bool:
-    value = coerce_http_url(url)
+@lru_cache(maxsize=1024)
+def _parse_http_url(url: str) -> tuple[str, ParseResult | None]:
+    value = str(url or "").strip()
     if not value:
-        return False
+        return "", None
     try:
         parsed = urlparse(value)
     except Exception:
-        return False
-    return parsed.scheme in {"http", "https"} and bool(parsed.netloc)
+        return value, None
+    if not parsed.scheme:
+        candidate = f"https:{value}" if value.startswith("//") else f"https://{value}"
+        try:
+            reparsed = urlparse(candidate)
+        except Exception:
+            return value, None
+        host = str(reparsed.netloc or "").strip()
+        if (not host) or (" " in host) or ("." not in host):
+            return value, None
+        value, parsed = candidate, reparsed
+    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+        return value, None
+    return value, parsed
 
 
+def validate_url(url: str) -> bool:
+    return _parse_http_url(url)[1] is not None
+
+
+@lru_cache(maxsize=1024)
 def normalize_batch_url(url: str) -> str:
-    value = coerce_http_url(url)
-    if not value:
-        return ""
-    try:
-        parsed = urlparse(value)
-    except Exception:
-        return value
-    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+    value, parsed = _parse_http_url(url)
+    if parsed is None:
         return value
 
     scheme = parsed.scheme.lower()
@@ -624,35 +736,41 @@ def normalize_batch_url(url: str) -> str:
         if not path:
             path = "/"
 
-    retained_pairs: list[tuple[str, str]] = []
-    for key, val in parse_qsl(parsed.query, keep_blank_values=True):
-        lowered = key.strip().lower()
-        if lowered.startswith("utm_") or lowered in _TRACKING_QUERY_KEYS:
-            continue
-        retained_pairs.append((key, val))
-    retained_pairs.sort(key=lambda pair: (pair[0].lower(), pair[1]))
-    query = urlencode(retained_pairs, doseq=True)
+    query = ""
+    if parsed.query:
+        retained_pairs: list[tuple[str, str, str]] = []
+        for segment in parsed.query.split("&"):
+            if not segment:
+                continue
+            raw_key, _, raw_val = segment.partition("=")
+            if _PLAIN_QUERY_PAIR_RE.fullmatch(segment):
+                key, val, encoded = raw_key, raw_val, segment
+            else:
+                key = unquote_plus(raw_key)
+                val = unquote_plus(raw_val)
+                encoded = f"{quote_plus(key)}={quote_plus(val)}"
+            lowered = key.strip().lower()
+            if lowered.startswith("utm_") or lowered in _TRACKING_QUERY_KEYS:
+                continue
+            retained_pairs.append((key.lower(), val, encoded))
+        retained_pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        query = "&".join(pair[2] for pair in retained_pairs)
 
     return urlunparse((scheme, netloc, path, parsed.params, query, ""))
 
 
 def _collect_format_inventory(info_dict: dict[str, object]) -> tuple[list[str], list[str]]:
     heights: set[int] = set()
-    other_extensions: set[str] = set()
     formats = info_dict.get("formats")
     for fmt in formats if isinstance(formats, list) else []:
         if not isinstance(fmt, dict):
             continue
         height = fmt.get("height")
-        vcodec = str(fmt.get("vcodec") or "")
-        if isinstance(height, int) and height > 0 and vcodec != "none":
+        if isinstance(height, int) and height > 0 and fmt.get("vcodec") != "none":
             heights.add(height)
 
-    for ext in CONVERSION_CONTAINER_ORDER:
-        other_extensions.add(ext)
-
     qualities = ["BEST QUALITY", *[f"{height}p" for height in sorted(heights, reverse=True)]]
-    return qualities, sorted(other_extensions)
+    return qualities, list(_SORTED_CONVERSION_CONTAINERS)
 
 
 def _merge_unique_formats(base_formats: list[str], extra_formats: list[str]) -> list[str]:
@@ -750,32 +868,28 @@ def _read_metadata_stderr_tail(stream: object) -> str:
         return ""
 
 
+@lru_cache(maxsize=128)
 def _quality_height(value: str) -> int | None:
     cleaned = str(value or "").strip().lower()
-    if not cleaned or cleaned in {"best", "best quality"}:
-        return None
     if cleaned.endswith("p"):
-        cleaned = cleaned[:-1]
-    try:
-        return int(cleaned)
-    except ValueError:
+        cleaned = cleaned[:-1].strip()
+    if not cleaned.isdecimal():
         return None
+    return int(cleaned)
 
 
-def _format_selector(format_choice: str, quality_choice: str) -> tuple[str, list[str]]:
+@lru_cache(maxsize=128)
+def _format_selector(format_choice: str, quality_choice: str) -> tuple[str, tuple[str, ...]]:
     raw_choice = str(format_choice or FormatChoice.VIDEO.value).strip()
     choice = raw_choice.upper()
     height = _quality_height(quality_choice)
-    post_args: list[str] = []
 
     if choice == FormatChoice.AUDIO.value:
-        return "bestaudio", post_args
+        return "bestaudio", _EMPTY_POST_ARGS
     if choice == FormatChoice.MP3.value:
-        post_args.extend(["--extract-audio", "--audio-format", "mp3", "--audio-quality", "0"])
-        return "bestaudio", post_args
+        return "bestaudio", _MP3_POST_ARGS
     if is_audio_format_choice(choice):
-        post_args.extend(["--extract-audio", "--audio-format", raw_choice.lower()])
-        return "bestaudio", post_args
+        return "bestaudio", ("--extract-audio", "--audio-format", raw_choice.lower())
 
     if height is None:
         height_selector = ""
@@ -787,36 +901,40 @@ def _format_selector(format_choice: str, quality_choice: str) -> tuple[str, list
             f"bestvideo[ext=mp4]{height_selector}+bestaudio[ext=m4a]/"
             f"best[ext=mp4]{height_selector}/best{height_selector}"
         )
-        post_args.extend(["--merge-output-format", "mp4"])
-        return selector, post_args
+        return selector, _MP4_POST_ARGS
 
-    if choice not in {
-        FormatChoice.VIDEO.value,
-        FormatChoice.AUDIO.value,
-        FormatChoice.MP4.value,
-        FormatChoice.MP3.value,
-    }:
+    if choice not in _BUILTIN_FORMAT_CHOICES:
         ext = raw_choice.lower()
         if choice in CONVERSION_CONTAINER_CHOICES:
             selector = (
                 f"bestvideo{height_selector}+bestaudio/"
                 f"best{height_selector}/best"
             )
-            post_args.extend(["--merge-output-format", ext])
-            return selector, post_args
+            return selector, ("--merge-output-format", ext)
         selector = (
             f"bestvideo[ext={ext}]{height_selector}+bestaudio/"
             f"best[ext={ext}]{height_selector}"
         )
-        return selector, post_args
+        return selector, _EMPTY_POST_ARGS
 
     selector = (
         f"bestvideo{height_selector}+bestaudio/"
         f"best{height_selector}/best"
     )
-    return selector, post_args
+    return selector, _EMPTY_POST_ARGS
+
 
+@lru_cache(maxsize=64)
+def _normalize_format_choice(format_choice: str) -> str:
+    return str(format_choice or "").strip().upper()
 
+
+@lru_cache(maxsize=64)
+def _format_choice_needs_conversion(choice: str) -> bool:
+    return (is_audio_format_choice(choice) and choice != _AUDIO_CHOICE) or choice in CONVERSION_CONTAINER_CHOICES
+
+
+@lru_cache(maxsize=64)
 def _fixed_output_extension(format_choice: str) -> str | None:
     raw_choice = str(format_choice or "").strip()
     if not raw_choice:
@@ -828,10 +946,7 @@ def _fixed_output_extension(format_choice: str) -> str | None:
         return "mp4"
     if choice in CONVERSION_CONTAINER_CHOICES:
         return choice.lower()
-    if choice in {
-        FormatChoice.VIDEO.value,
-        FormatChoice.AUDIO.value,
-    }:
+    if choice in _UNFIXED_EXTENSION_CHOICES:
         return None
     candidate = re.sub(r"[^a-z0-9]+", "", raw_choice.lower())
     return candidate or None
@@ -873,10 +988,10 @@ def sanitize_filename_template(value: str) -> str:
     normalized = text.replace("\\", "/")
     if normalized.startswith("/"):
         return _DEFAULT_OUTPUT_TEMPLATE
-    if re.match(r"^[A-Za-z]:/", normalized):
+    drive = normalized[:1]
+    if normalized[1:3] == ":/" and drive.isascii() and drive.isalpha():
         return _DEFAULT_OUTPUT_TEMPLATE
-    segments = [segment for segment in normalized.split("/") if segment not in {"", "."}]
-    if any(segment == ".." for segment in segments):
+    if ".." in normalized.split("/"):
         return _DEFAULT_OUTPUT_TEMPLATE
     return text
 
@@ -919,6 +1034,15 @@ def _apply_runtime_template_tokens(
     return resolved
 
 
+@lru_cache(maxsize=128)
+def _runtime_output_template(filename_template: str, format_choice: str, quality_choice: str) -> str:
+    return _apply_runtime_template_tokens(
+        sanitize_filename_template(filename_template),
+        format_choice=format_choice,
+        quality_choice=quality_choice,
+    )
+
+
 def _resolve_output_template(
     *,
     output_dir: Path,
@@ -926,11 +1050,10 @@ def _resolve_output_template(
     job: DownloadJob,
     conflict_policy: str = "skip",
 ) -> str:
-    sanitized_template = sanitize_filename_template(filename_template)
-    runtime_template = _apply_runtime_template_tokens(
-        sanitized_template,
-        format_choice=job.format_choice,
-        quality_choice=job.quality_choice,
+    runtime_template = _runtime_output_template(
+        filename_template,
+        job.format_choice,
+        job.quality_choice,
     )
     return _with_forced_extension(
         str(output_dir / runtime_template),
@@ -946,30 +1069,41 @@ def normalize_conflict_policy(value: str) -> str:
 
 
 def _is_important_log_line(line: str) -> bool:
-    value = str(line or "").strip()
-    if not value:
-        return False
-    lowered = value.lower()
-    return any(token in lowered for token in _IMPORTANT_LOG_TOKENS)
+    return _IMPORTANT_LOG_RE.search(str(line or "").lower()) is not None
 
 
 def _is_post_processing_line(line: str) -> bool:
-    value = str(line or "").strip()
-    if not value:
-        return False
-    lowered = value.lower()
-    return any(token in lowered for token in _POST_PROCESSING_LINE_TOKENS)
+    return _POST_PROCESSING_LINE_RE.search(str(line or "").lower()) is not None
 
 
 def sanitize_error_text(value: object) -> str:
     text = str(value or "")
     if not text:
         return ""
-    no_ansi = _ANSI_ESCAPE_RE.sub("", text)
-    no_ctrl = _CONTROL_CHAR_RE.sub("", no_ansi)
-    collapsed = no_ctrl.replace("\r", "\n")
-    collapsed = re.sub(r"\n{3,}", "\n\n", collapsed)
-    return collapsed.strip()
+    if "\x1b" in text:
+        text = _ANSI_ESCAPE_RE.sub("", text)
+    if text.isprintable():
+        return text.strip()
+    text = text.translate(_ERROR_TEXT_TRANSLATION)
+    if "\n\n\n" in text:
+        text = _BLANK_LINE_RUN_RE.sub("\n\n", text)
+    return text.strip()
+
+
+def _extract_percent_text(text: str) -> str:
+    index = text.find("%")
+    while index >= 0:
+        start = index
+        while start > 0 and text[start - 1].isdecimal():
+            start -= 1
+        if start < index:
+            if start > 1 and text[start - 1] == "." and text[start - 2].isdecimal():
+                start -= 1
+                while start > 0 and text[start - 1].isdecimal():
+                    start -= 1
+            return text[start:index]
+        index = text.find("%", index + 1)
+    return ""
 
 
 def _progress_number(value: object) -> float | None:
@@ -998,11 +1132,10 @@ def _progress_percent_from_payload(payload: dict[str, Any]) -> float | None:
         return (fragment_index / fragment_count) * 100.0
 
     for key in ("_percent_str", "_progress_str"):
-        text = sanitize_error_text(payload.get(key))
-        match = _PROGRESS_RE.search(text)
-        if match:
+        percent_text = _extract_percent_text(sanitize_error_text(payload.get(key)))
+        if percent_text:
             try:
-                return float(match.group("percent"))
+                return float(percent_text)
             except ValueError:
                 return None
 
@@ -1031,33 +1164,38 @@ def _format_speed_bytes_per_second(value: object) -> str:
     return f"{_format_size_human(int(speed))}/s"
 
 
-def _parse_size_bytes(value: str, unit: str) -> int | None:
+def _subprocess_spawn_kwargs() -> dict[str, Any]:
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW}
+    return {"start_new_session": True}
+
+
+def _iter_pipe_lines(stream: Any, *, idle_timeout: float | None = None) -> Iterator[str]:
+    fd = stream.fileno()
+    selector: selectors.BaseSelector | None = None
+    if idle_timeout is not None and os.name != "nt":
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+    pending = b""
     try:
-        number = float(str(value or "").strip())
-    except (TypeError, ValueError):
-        return None
-    if not math.isfinite(number) or number <= 0:
-        return None
-    normalized_unit = str(unit or "").strip().lower()
-    powers = {
-        "b": 0,
-        "kb": 1,
-        "kib": 1,
-        "mb": 2,
-        "mib": 2,
-        "gb": 3,
-        "gib": 3,
-        "tb": 4,
-        "tib": 4,
-        "pb": 5,
-        "pib": 5,
-        "eb": 6,
-        "eib": 6,
-    }
-    power = powers.get(normalized_unit)
-    if power is None:
-        return None
-    return int(number * (1024 ** power))
+        while True:
+            if selector is not None and not selector.select(idle_timeout):
+                yield ""
+                continue
+            chunk = os.read(fd, _PIPE_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            pending += chunk
+            if b"\r" in pending:
+                pending = pending.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            *lines, pending = pending.split(b"\n")
+            for raw_line in lines:
+                yield raw_line.decode("utf-8", errors="replace")
+        if pending:
+            yield pending.decode("utf-8", errors="replace")
+    finally:
+        if selector is not None:
+            selector.close()
 
 
 class _TransferRateEstimator:
@@ -1098,6 +1236,32 @@ class _TransferRateEstimator:
         return self._last_detail
 
 
+class _ProgressThrottle:
+    def __init__(self, min_interval: float = _PROGRESS_EMIT_INTERVAL_SECONDS) -> None:
+        self._min_interval = float(min_interval)
+        self._last_emit_at = float("-inf")
+
+    def ready(self, percent: float) -> bool:
+        now = time.monotonic()
+        if percent < 99.0 and (now - self._last_emit_at) < self._min_interval:
+            return False
+        self._last_emit_at = now
+        return True
+
+
+def _progress_payload_from_template_line(line: str) -> dict[str, float | None] | None:
+    fields = line[len(_PROGRESS_TEMPLATE_PREFIX) :].split()
+    if len(fields) != len(_PROGRESS_TEMPLATE_FIELDS):
+        return None
+    payload: dict[str, float | None] = {}
+    for key, raw_value in zip(_PROGRESS_TEMPLATE_FIELDS, fields):
+        try:
+            payload[key] = float(raw_value)
+        except ValueError:
+            payload[key] = None
+    return payload
+
+
 def _progress_message_from_payload(payload: dict[str, Any], estimator: _TransferRateEstimator | None = None) -> str:
     parts = ["Downloading..."]
     percent_text = sanitize_error_text(payload.get("_percent_str"))
@@ -1120,36 +1284,11 @@ def _progress_message_from_payload(payload: dict[str, Any], estimator: _Transfer
     return " | ".join(parts)
 
 
-def _progress_message_from_download_line(line: str, estimator: _TransferRateEstimator | None = None) -> str:
-    clean = sanitize_error_text(line)
-    if clean.lower().startswith("[download]"):
-        detail = clean[len("[download]") :].strip()
-        if detail:
-            parts = ["Downloading..."]
-            percent_match = _PROGRESS_RE.search(detail)
-            total_match = _DOWNLOAD_LINE_TOTAL_RE.search(detail)
-            percent = str(percent_match.group("percent") if percent_match else "").strip()
-            eta = ""
-            speed = ""
-            if estimator is not None and percent_match and total_match:
-                total = _parse_size_bytes(total_match.group("size"), total_match.group("unit"))
-                downloaded = None
-                if total is not None:
-                    try:
-                        downloaded = (float(percent) / 100.0) * float(total)
-                    except ValueError:
-                        downloaded = None
-                eta, speed = estimator.update(downloaded_bytes=downloaded, total_bytes=float(total) if total else None)
-            if percent:
-                parts.append(f"{percent}%")
-            if eta:
-                parts.append(f"ETA {eta}")
-            if speed:
-                parts.append(speed)
-            if len(parts) > 1:
-                return " | ".join(parts)
-            return f"Downloading... | {detail}"
-    return clean
+@lru_cache(maxsize=1)
+def _youtube_dl_class() -> type[Any]:
+    from yt_dlp import YoutubeDL
+
+    return YoutubeDL
 
 
 def _resolved_node_js_runtime_path() -> str:
@@ -1161,33 +1300,16 @@ def _resolved_node_js_runtime_path() -> str:
     return node_path
 
 
-def _yt_dlp_js_runtime_cli_args() -> list[str]:
-    node_path = _resolved_node_js_runtime_path()
-    if not node_path:
-        return []
-    return ["--js-runtimes", f"node:{node_path}"]
-
-
-def _yt_dlp_js_runtime_api_options() -> dict[str, dict[str, str]]:
-    node_path = _resolved_node_js_runtime_path()
-    if not node_path:
-        return {}
-    return {"node": {"path": node_path}}
-
-
 def is_retryable_error(error_text: str) -> bool:
-    value = str(error_text or "").strip().lower()
-    if not value:
+    value = str(error_text or "").lower()
+    if not value or _NON_RETRYABLE_ERROR_RE.search(value) is not None:
         return False
-    if any(token in value for token in _NON_RETRYABLE_ERROR_TOKENS):
-        return False
-    return any(token in value for token in _RETRYABLE_ERROR_TOKENS)
+    return _RETRYABLE_ERROR_RE.search(value) is not None
 
 
 def _friendly_format_error(job: DownloadJob, error_text: str) -> str:
     value = sanitize_error_text(error_text)
-    lowered = value.lower()
-    if not any(token in lowered for token in _FORMAT_UNAVAILABLE_ERROR_TOKENS):
+    if _FORMAT_UNAVAILABLE_ERROR_RE.search(value.lower()) is None:
         return value
     format_choice = str(job.format_choice or "VIDEO").strip().upper() or "VIDEO"
     quality_choice = str(job.quality_choice or "").strip().upper()
@@ -1201,11 +1323,12 @@ def _friendly_format_error(job: DownloadJob, error_text: str) -> str:
 
 
 def normalize_download_state(value: str) -> str:
+    if isinstance(value, str):
+        canonical = _DOWNLOAD_STATE_VALUES.get(value)
+        if canonical is not None:
+            return canonical
     candidate = str(value or "").strip().lower()
-    try:
-        return DownloadState(candidate).value
-    except ValueError:
-        return DownloadState.ERROR.value
+    return _DOWNLOAD_STATE_VALUES.get(candidate, _STATE_ERROR)
 
 
 def normalize_retry_profile(value: str) -> str:
@@ -1226,19 +1349,57 @@ def retry_limit_for_profile(*, retry_count: int, retry_profile: str) -> int:
     return configured
 
 
-def retry_backoff_seconds(*, attempt_index: int, retry_profile: str) -> float:
-                                           
+def retry_backoff_seconds(
+    *,
+    attempt_index: int,
+    retry_profile: str,
+    previous_delay: float = 0.0,
+) -> float:
     attempt = max(1, int(attempt_index))
     normalized_profile = normalize_retry_profile(retry_profile)
     if normalized_profile == RetryProfile.OFF.value:
         return 0.0
     if normalized_profile == RetryProfile.AGGRESSIVE.value:
-        base = min(8.0, 0.60 * (2 ** (attempt - 1)))
-        jitter = random.uniform(0.0, 0.45)
-        return base + jitter
-    base = min(2.5, 0.35 * (2 ** (attempt - 1)))
-    jitter = random.uniform(0.0, 0.20)
-    return base + jitter
+        base, cap = 0.60, 8.0
+    else:
+        base, cap = 0.35, 2.5
+    previous = float(previous_delay or 0.0)
+    if previous <= 0:
+        previous = min(cap, base * (2 ** max(0, attempt - 2)))
+    return min(cap, random.uniform(base, max(base, previous) * 3.0))
+
+
+class _MetadataResultCache:
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl_seconds = float(ttl_seconds)
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[str, str], tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if (now - stored_at) > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: tuple[str, str], value: object) -> None:
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 class _InProcessCancelled(RuntimeError):
@@ -1251,19 +1412,94 @@ class _InProcessPaused(RuntimeError):
 
 class DownloadService:
     def __init__(self) -> None:
-        self._active_processes: set[subprocess.Popen[str]] = set()
-        self._active_metadata_processes: set[subprocess.Popen[str]] = set()
+        self._active_processes: weakref.WeakSet[subprocess.Popen[bytes]] = weakref.WeakSet()
+        self._active_metadata_processes: weakref.WeakSet[subprocess.Popen[bytes]] = weakref.WeakSet()
         self._active_lock = threading.Lock()
         self._control_condition = threading.Condition()
         self._control_change_counter = 0
-        self._active_job_processes: dict[str, subprocess.Popen[str]] = {}
-        self._paused_job_ids: set[str] = set()
-        self._stopped_job_ids: set[str] = set()
+        self._active_job_processes: dict[str, subprocess.Popen[bytes]] = {}
+        self._job_interrupts: dict[str, str] = {}
         self._batch_lock = threading.Lock()
-        self._active_batch_queue: queue.Queue[object] | None = None
+        self._batch_condition = threading.Condition(self._batch_lock)
+        self._active_batch_queue: deque[object] | None = None
         self._active_batch_pending_jobs = 0
         self._active_batch_status_cb: StatusCallback | None = None
         self._active_batch_accepting = False
+        self._batch_pool: concurrent.futures.ThreadPoolExecutor | None = None
+        self._metadata_ydl_pool: OrderedDict[tuple[tuple[str, object], ...], list[Any]] = OrderedDict()
+        self._metadata_ydl_pool_lock = threading.Lock()
+        self._metadata_cache = _MetadataResultCache(
+            ttl_seconds=_METADATA_CACHE_TTL_SECONDS,
+            max_entries=_METADATA_CACHE_MAX_ENTRIES,
+        )
+        self._ffmpeg_path_cache: str | None = None
+        self._resolved_output_dirs: dict[str, Path] = {}
+        self._node_runtime_path_cache: str | None = None
+        self._download_option_args_cache: dict[tuple[str, bool, str, int, bool], tuple[str, ...]] = {}
+
+    def _ffmpeg_path(self) -> str | None:
+        cached = self._ffmpeg_path_cache
+        if cached:
+            return cached
+        resolved = resolve_binary("ffmpeg") or None
+        self._ffmpeg_path_cache = resolved
+        return resolved
+
+    def refresh_ffmpeg_path(self) -> None:
+        self._ffmpeg_path_cache = None
+
+    def _node_runtime_path(self) -> str:
+        cached = self._node_runtime_path_cache
+        if cached is None:
+            cached = _resolved_node_js_runtime_path()
+            self._node_runtime_path_cache = cached
+        return cached
+
+    def _reset_batch_caches(self) -> None:
+        self._resolved_output_dirs.clear()
+        self._node_runtime_path_cache = None
+        self._download_option_args_cache.clear()
+
+    def _download_option_args(
+        self,
+        *,
+        ffmpeg_path: str,
+        skip_existing_files: bool,
+        conflict_policy: str,
+        rate_limit: int,
+        save_metadata_to_file: bool,
+    ) -> tuple[str, ...]:
+        key = (ffmpeg_path, skip_existing_files, conflict_policy, rate_limit, save_metadata_to_file)
+        cached = self._download_option_args_cache.get(key)
+        if cached is not None:
+            return cached
+        args: list[str] = []
+        if ffmpeg_path:
+            args.extend(["--ffmpeg-location", ffmpeg_path])
+        node_path = self._node_runtime_path()
+        if node_path:
+            args.extend(["--js-runtimes", f"node:{node_path}"])
+        if skip_existing_files or conflict_policy in {"skip", "rename"}:
+            args.append("--no-overwrites")
+        elif conflict_policy == "overwrite":
+            args.append("--force-overwrites")
+        if rate_limit > 0:
+            args.extend(["--limit-rate", f"{rate_limit}K"])
+        if save_metadata_to_file:
+            args.append("--add-metadata")
+        option_args = tuple(args)
+        self._download_option_args_cache[key] = option_args
+        return option_args
+
+    def _resolve_output_dir(self, raw_output_dir: str) -> Path:
+        key = str(raw_output_dir)
+        cached = self._resolved_output_dirs.get(key)
+        if cached is not None:
+            return cached
+        output_dir = Path(key).expanduser().resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self._resolved_output_dirs[key] = output_dir
+        return output_dir
 
     def enqueue_batch_job(self, job: DownloadJob) -> bool:
         job_id = str(job.job_id or "").strip()
@@ -1274,11 +1510,11 @@ class DownloadService:
             if (jobs_queue is None) or (not self._active_batch_accepting):
                 return False
             self._active_batch_pending_jobs += 1
-            jobs_queue.put(job)
+            jobs_queue.append(job)
+            self._batch_condition.notify()
             status_cb = self._active_batch_status_cb
         with self._active_lock:
-            self._stopped_job_ids.discard(job_id)
-            self._paused_job_ids.discard(job_id)
+            self._job_interrupts.pop(job_id, None)
         if status_cb:
             try:
                 status_cb(job_id, DownloadState.QUEUED.value)
@@ -1292,6 +1528,9 @@ class DownloadService:
             self._control_change_counter += 1
             self._control_condition.notify_all()
 
+    def wake_control_waiters(self) -> None:
+        self._notify_control_changed()
+
     def _wait_for_retry_window(
         self,
         *,
@@ -1299,17 +1538,20 @@ class DownloadService:
         cancel_token: threading.Event,
         job_id: str,
     ) -> str | None:
-        deadline = time.time() + max(0.0, float(delay_seconds))
-        while True:
+        deadline = time.monotonic() + max(0.0, float(delay_seconds))
+        interrupt_state: str | None = None
+
+        def interrupted_or_elapsed() -> bool:
+            nonlocal interrupt_state
             interrupt_state = self._resolve_interrupt_state(job_id, cancel_token)
-            if interrupt_state:
-                return interrupt_state
-            remaining = deadline - time.time()
-            if remaining <= 0:
-                break
-            with self._control_condition:
-                self._control_condition.wait(timeout=min(remaining, 0.5))
-        return None
+            return bool(interrupt_state) or time.monotonic() >= deadline
+
+        with self._control_condition:
+            self._control_condition.wait_for(
+                interrupted_or_elapsed,
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+        return interrupt_state or None
 
     @classmethod
     def _should_use_inprocess_runner(cls) -> bool:
@@ -1323,8 +1565,10 @@ class DownloadService:
         return bool(getattr(sys, "frozen", False))
 
     @staticmethod
-    def _resolve_explicit_yt_dlp_binary() -> str | None:
-        explicit = str(os.environ.get(_YTDLP_BINARY_ENV, "")).strip()
+    def _resolve_explicit_yt_dlp_binary(explicit: str | None = None) -> str | None:
+        if explicit is None:
+            explicit = os.environ.get(_YTDLP_BINARY_ENV, "")
+        explicit = str(explicit or "").strip()
         if not explicit:
             return None
         candidate = Path(explicit).expanduser()
@@ -1332,19 +1576,29 @@ class DownloadService:
             return str(candidate)
         return None
 
-    @classmethod
-    def _resolve_yt_dlp_subprocess_prefix(cls) -> list[str]:
-        explicit_binary = cls._resolve_explicit_yt_dlp_binary()
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _cached_yt_dlp_subprocess_prefix(explicit: str, frozen: bool) -> tuple[str, ...]:
+        explicit_binary = DownloadService._resolve_explicit_yt_dlp_binary(explicit)
         if explicit_binary:
-            return [explicit_binary]
-        if getattr(sys, "frozen", False):
+            return (explicit_binary,)
+        if frozen:
             binary = resolve_binary("yt-dlp")
             if binary:
-                return [binary]
+                return (binary,)
             raise FileNotFoundError(
                 "yt-dlp executable was not found. Place yt-dlp.exe next to the app or in PATH."
             )
-        return [sys.executable, "-m", "yt_dlp"]
+        return (sys.executable, "-m", "yt_dlp")
+
+    @classmethod
+    def _resolve_yt_dlp_subprocess_prefix(cls) -> list[str]:
+        return list(
+            cls._cached_yt_dlp_subprocess_prefix(
+                str(os.environ.get(_YTDLP_BINARY_ENV, "")),
+                bool(getattr(sys, "frozen", False)),
+            )
+        )
 
     @classmethod
     def _can_run_subprocess_runner(cls) -> bool:
@@ -1400,18 +1654,14 @@ class DownloadService:
         env = dict(os.environ)
         env[_METADATA_WORKER_ENV] = "1"
         env.setdefault("PYTHONIOENCODING", "utf-8")
-        creationflags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
         stderr_stream = tempfile.TemporaryFile(mode="w+t", encoding="utf-8", errors="replace")
         try:
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=stderr_stream,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 env=env,
-                creationflags=creationflags,
+                **_subprocess_spawn_kwargs(),
             )
         except Exception as exc:
             try:
@@ -1423,7 +1673,8 @@ class DownloadService:
 
         try:
             deadline = time.monotonic() + self._metadata_subprocess_timeout(timeout_seconds)
-            while process.poll() is None:
+            stdout = b""
+            while True:
                 if cancel_token is not None and cancel_token.is_set():
                     self._kill_process_tree(process)
                     try:
@@ -1439,22 +1690,24 @@ class DownloadService:
                     except Exception:
                         pass
                     return False, None, "Metadata worker timed out."
-                time.sleep(min(0.1, remaining))
-
-            try:
-                stdout, _stderr = process.communicate(timeout=1.0)
-            except Exception:
-                stdout = ""
+                try:
+                    stdout, _stderr = process.communicate(timeout=min(0.1, remaining))
+                except subprocess.TimeoutExpired:
+                    continue
+                except Exception:
+                    stdout = b""
+                break
             stderr = _read_metadata_stderr_tail(stderr_stream)
 
-            output = str(stdout or "").strip()
+            output = (stdout or b"").strip()
             if process.returncode != 0 and not output:
                 detail = sanitize_error_text(stderr or f"Metadata worker exited with {process.returncode}")
                 return False, None, detail
             try:
                 envelope = json.loads(output)
-            except json.JSONDecodeError:
-                detail = sanitize_error_text(stderr or output or "Metadata worker returned invalid JSON.")
+            except ValueError:
+                output_text = output.decode("utf-8", errors="replace")
+                detail = sanitize_error_text(stderr or output_text or "Metadata worker returned invalid JSON.")
                 return False, None, detail or "Metadata worker returned invalid JSON."
             if not isinstance(envelope, dict):
                 return False, None, "Metadata worker returned an invalid response."
@@ -1487,25 +1740,33 @@ class DownloadService:
         timeout_seconds: float | None = None,
         cancel_token: threading.Event | None = None,
     ) -> FormatProbeResult:
-        if not self._metadata_worker_enabled():
-            return self._probe_formats_inprocess(url, timeout_seconds=timeout_seconds)
-        value = coerce_http_url(url)
-        if not validate_url(value):
+        value, parsed = _parse_http_url(url)
+        if parsed is None:
             return FormatProbeResult(title="", formats=_default_format_choices(), qualities=["BEST QUALITY"], error="Invalid URL")
-        ok, payload, error = self._run_metadata_subprocess(
-            "probe",
-            value,
-            timeout_seconds=timeout_seconds,
-            cancel_token=cancel_token,
-        )
-        if not ok:
-            return FormatProbeResult(
-                title="",
-                formats=_default_format_choices(),
-                qualities=["BEST QUALITY"],
-                error=error or "Metadata probe failed.",
+        cache_key = ("probe", normalize_batch_url(value))
+        cached = self._metadata_cache.get(cache_key)
+        if isinstance(cached, FormatProbeResult):
+            return cached
+        if not self._metadata_worker_enabled():
+            result = self._probe_formats_inprocess(value, timeout_seconds=timeout_seconds)
+        else:
+            ok, payload, error = self._run_metadata_subprocess(
+                "probe",
+                value,
+                timeout_seconds=timeout_seconds,
+                cancel_token=cancel_token,
             )
-        return _format_probe_from_payload(payload)
+            if not ok:
+                return FormatProbeResult(
+                    title="",
+                    formats=_default_format_choices(),
+                    qualities=["BEST QUALITY"],
+                    error=error or "Metadata probe failed.",
+                )
+            result = _format_probe_from_payload(payload)
+        if not result.error:
+            self._metadata_cache.put(cache_key, result)
+        return result
 
     def analyze_url_cancellable(
         self,
@@ -1514,9 +1775,9 @@ class DownloadService:
         timeout_seconds: float | None = None,
         cancel_token: threading.Event | None = None,
     ) -> UrlAnalysisResult:
-        value = coerce_http_url(url)
+        value, parsed = _parse_http_url(url)
         normalized = normalize_batch_url(value)
-        if not validate_url(value):
+        if parsed is None:
             return UrlAnalysisResult(
                 url_raw=value,
                 url_normalized=normalized,
@@ -1525,24 +1786,33 @@ class DownloadService:
                 qualities=["BEST QUALITY"],
                 error="Invalid URL",
             )
+        cache_key = ("analyze", normalized)
+        cached = self._metadata_cache.get(cache_key)
+        if isinstance(cached, UrlAnalysisResult):
+            cached.url_raw = value
+            return cached
         if not self._metadata_worker_enabled():
-            return self._analyze_url_inprocess(value, timeout_seconds=timeout_seconds)
-        ok, payload, error = self._run_metadata_subprocess(
-            "analyze",
-            value,
-            timeout_seconds=timeout_seconds,
-            cancel_token=cancel_token,
-        )
-        if not ok:
-            return UrlAnalysisResult(
-                url_raw=value,
-                url_normalized=normalized,
-                is_valid=False,
-                formats=_default_format_choices(),
-                qualities=["BEST QUALITY"],
-                error=error or "Metadata analysis failed.",
+            result = self._analyze_url_inprocess(value, timeout_seconds=timeout_seconds)
+        else:
+            ok, payload, error = self._run_metadata_subprocess(
+                "analyze",
+                value,
+                timeout_seconds=timeout_seconds,
+                cancel_token=cancel_token,
             )
-        return _url_analysis_from_payload(payload, url=value)
+            if not ok:
+                return UrlAnalysisResult(
+                    url_raw=value,
+                    url_normalized=normalized,
+                    is_valid=False,
+                    formats=_default_format_choices(),
+                    qualities=["BEST QUALITY"],
+                    error=error or "Metadata analysis failed.",
+                )
+            result = _url_analysis_from_payload(payload, url=value)
+        if result.is_valid and not result.error:
+            self._metadata_cache.put(cache_key, result)
+        return result
 
     def resolve_selection_size_bytes_cancellable(
         self,
@@ -1589,7 +1859,7 @@ class DownloadService:
                 error="Invalid URL",
             )
         try:
-            from yt_dlp import YoutubeDL
+            YoutubeDL = _youtube_dl_class()
         except Exception as exc:
             return FormatProbeResult(
                 title="",
@@ -1600,8 +1870,7 @@ class DownloadService:
 
         try:
             opts = _metadata_extract_options(timeout_seconds)
-            with YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(value, download=False)
+            info = self._metadata_extract_info(YoutubeDL, opts, value)
         except Exception as exc:
             return FormatProbeResult(
                 title="",
@@ -1623,6 +1892,58 @@ class DownloadService:
     def analyze_url(self, url: str, *, timeout_seconds: float | None = None) -> UrlAnalysisResult:
         return self.analyze_url_cancellable(url, timeout_seconds=timeout_seconds)
 
+    def _metadata_extract_info(self, ydl_class: Any, opts: dict[str, object], url: str) -> object:
+        pool_key = tuple(sorted(opts.items()))
+        with self._metadata_ydl_pool_lock:
+            idle = self._metadata_ydl_pool.get(pool_key)
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            ydl = ydl_class(opts)
+        try:
+            info = ydl.extract_info(url, download=False)
+        except BaseException:
+            with contextlib.suppress(Exception):
+                ydl.close()
+            raise
+        evicted: list[Any] = []
+        with self._metadata_ydl_pool_lock:
+            idle = self._metadata_ydl_pool.setdefault(pool_key, [])
+            self._metadata_ydl_pool.move_to_end(pool_key)
+            if len(idle) < _METADATA_YDL_IDLE_LIMIT:
+                idle.append(ydl)
+                ydl = None
+            while len(self._metadata_ydl_pool) > _METADATA_YDL_POOL_MAX_KEYS:
+                _key, instances = self._metadata_ydl_pool.popitem(last=False)
+                evicted.extend(instances)
+        if ydl is not None:
+            evicted.append(ydl)
+        for instance in evicted:
+            with contextlib.suppress(Exception):
+                instance.close()
+        return info
+
+    def close(self) -> None:
+        with self._metadata_ydl_pool_lock:
+            idle = [ydl for instances in self._metadata_ydl_pool.values() for ydl in instances]
+            self._metadata_ydl_pool.clear()
+        for ydl in idle:
+            with contextlib.suppress(Exception):
+                ydl.close()
+        with self._batch_lock:
+            batch_pool = self._batch_pool
+            self._batch_pool = None
+        if batch_pool is not None:
+            batch_pool.shutdown(wait=False)
+
+    def _shared_batch_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._batch_lock:
+            if self._batch_pool is None:
+                self._batch_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=BATCH_CONCURRENCY_MAX,
+                    thread_name_prefix="mc-batch",
+                )
+            return self._batch_pool
+
     def _analyze_url_inprocess(self, url: str, *, timeout_seconds: float | None = None) -> UrlAnalysisResult:
         value = coerce_http_url(url)
         normalized = normalize_batch_url(value)
@@ -1638,7 +1959,7 @@ class DownloadService:
             )
 
         try:
-            from yt_dlp import YoutubeDL
+            YoutubeDL = _youtube_dl_class()
         except Exception as exc:
             return UrlAnalysisResult(
                 url_raw=value,
@@ -1651,8 +1972,7 @@ class DownloadService:
 
         try:
             opts = _metadata_extract_options(timeout_seconds)
-            with YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(value, download=False)
+            info = self._metadata_extract_info(YoutubeDL, opts, value)
         except Exception as exc:
             return UrlAnalysisResult(
                 url_raw=value,
@@ -1666,12 +1986,12 @@ class DownloadService:
         info_dict = info if isinstance(info, dict) else {}
         qualities, other_formats = _collect_format_inventory(info_dict)
         merged_formats = _merge_unique_formats(default_formats, other_formats)
-        expected_size = _extract_expected_size_bytes(info_dict)
         selection_estimates = _build_selection_size_estimates(
             info_dict,
             formats=merged_formats,
             qualities=qualities,
         )
+        expected_size = selection_estimates.get(_SIZE_ESTIMATE_DEFAULT_KEY)
         duration_seconds = _extract_duration_seconds(info_dict)
         source_label = _extract_source_label(info_dict, value)
         return UrlAnalysisResult(
@@ -1716,7 +2036,7 @@ class DownloadService:
         if not validate_url(value):
             return None
         try:
-            from yt_dlp import YoutubeDL
+            YoutubeDL = _youtube_dl_class()
         except Exception:
             return None
 
@@ -1724,8 +2044,7 @@ class DownloadService:
         opts = _metadata_extract_options(timeout_seconds)
         opts["format"] = selector
         try:
-            with YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(value, download=False)
+            info = self._metadata_extract_info(YoutubeDL, opts, value)
         except Exception:
             return None
 
@@ -1744,12 +2063,12 @@ class DownloadService:
         if is_audio_format_choice(choice):
             formats_raw = info_dict.get("formats")
             full_formats = formats_raw if isinstance(formats_raw, list) else []
-            enriched = _enrich_format_sizes(requested_items or full_formats, duration_seconds=duration_seconds)
+            table = _build_format_size_table(requested_items or full_formats, duration_seconds=duration_seconds)
             if choice == FormatChoice.MP3.value:
-                return _estimate_mp3_size(enriched, duration_seconds=duration_seconds)
+                return _estimate_mp3_size(table, duration_seconds=duration_seconds)
             if selection_size is not None:
                 return int(selection_size)
-            return _best_audio_size(enriched)
+            return _best_audio_size(table)
 
         if selection_size is not None:
             return int(selection_size)
@@ -1766,8 +2085,7 @@ class DownloadService:
         save_metadata_to_file: bool = False,
         speed_limit_kbps: int = 0,
     ) -> tuple[list[str], str]:
-        output_dir = Path(job.output_dir).expanduser().resolve()
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self._resolve_output_dir(job.output_dir)
 
         selector, post_args = _format_selector(job.format_choice, job.quality_choice)
         output_template = _resolve_output_template(
@@ -1783,6 +2101,8 @@ class DownloadService:
             *self._resolve_yt_dlp_subprocess_prefix(),
             "--newline",
             "--progress",
+            "--progress-template",
+            _PROGRESS_TEMPLATE,
             "--no-playlist",
             "--no-warnings",
             "-f",
@@ -1793,13 +2113,9 @@ class DownloadService:
             "after_move:filepath",
         ]
 
-        ffmpeg_path = resolve_binary("ffmpeg")
-        choice = str(job.format_choice or "").strip().upper()
-        needs_conversion = (
-            (is_audio_format_choice(choice) and choice != FormatChoice.AUDIO.value)
-            or choice in CONVERSION_CONTAINER_CHOICES
-        )
-        if needs_conversion and not ffmpeg_path:
+        ffmpeg_path = self._ffmpeg_path()
+        choice = _normalize_format_choice(job.format_choice)
+        if _format_choice_needs_conversion(choice) and not ffmpeg_path:
             raise FileNotFoundError(
                 "ffmpeg is required for the selected format conversion. Install ffmpeg and retry."
             )
@@ -1807,36 +2123,21 @@ class DownloadService:
             raise FileNotFoundError(
                 "ffmpeg is required to embed metadata into the downloaded file. Install ffmpeg and retry."
             )
-        if ffmpeg_path:
-            command.extend(["--ffmpeg-location", ffmpeg_path])
-        command.extend(_yt_dlp_js_runtime_cli_args())
-
-        if normalized_conflict_policy in {"skip", "rename"}:
-            command.append("--no-overwrites")
-        elif normalized_conflict_policy == "overwrite":
-            command.append("--force-overwrites")
-
-        if skip_existing_files and normalized_conflict_policy != "rename":
-                                                                                    
-                                                                                      
-            if "--force-overwrites" in command:
-                command = [item for item in command if item != "--force-overwrites"]
-            if "--no-overwrites" not in command:
-                command.append("--no-overwrites")
-
-        rate_limit = max(0, int(speed_limit_kbps))
-        if rate_limit > 0:
-            command.extend(["--limit-rate", f"{rate_limit}K"])
-
-        if save_metadata_to_file:
-            command.append("--add-metadata")
-
+        command.extend(
+            self._download_option_args(
+                ffmpeg_path=ffmpeg_path or "",
+                skip_existing_files=bool(skip_existing_files),
+                conflict_policy=normalized_conflict_policy,
+                rate_limit=max(0, int(speed_limit_kbps)),
+                save_metadata_to_file=bool(save_metadata_to_file),
+            )
+        )
         command.extend(post_args)
         command.append(coerce_http_url(job.url))
         return command, output_template
 
     @staticmethod
-    def _kill_process_tree(process: subprocess.Popen[str]) -> None:
+    def _kill_process_tree(process: subprocess.Popen[bytes]) -> None:
         if process.poll() is not None:
             return
         try:
@@ -1847,30 +2148,38 @@ class DownloadService:
                     stderr=subprocess.DEVNULL,
                     check=False,
                 )
-            else:
-                process.terminate()
-                process.wait(timeout=1.0)
+                return
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                return
+            try:
+                process.wait(timeout=_PROCESS_TERMINATE_GRACE_SECONDS)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            os.killpg(process.pid, signal.SIGKILL)
         except Exception:
             try:
                 process.kill()
             except Exception:
                 pass
 
-    def _register_process(self, process: subprocess.Popen[str], job_id: str) -> None:
+    def _register_process(self, process: subprocess.Popen[bytes], job_id: str) -> None:
         with self._active_lock:
             self._active_processes.add(process)
             self._active_job_processes[str(job_id or "").strip()] = process
 
-    def _unregister_process(self, process: subprocess.Popen[str], job_id: str) -> None:
+    def _unregister_process(self, process: subprocess.Popen[bytes], job_id: str) -> None:
         with self._active_lock:
             self._active_processes.discard(process)
             self._active_job_processes.pop(str(job_id or "").strip(), None)
 
-    def _register_metadata_process(self, process: subprocess.Popen[str]) -> None:
+    def _register_metadata_process(self, process: subprocess.Popen[bytes]) -> None:
         with self._active_lock:
             self._active_metadata_processes.add(process)
 
-    def _unregister_metadata_process(self, process: subprocess.Popen[str]) -> None:
+    def _unregister_metadata_process(self, process: subprocess.Popen[bytes]) -> None:
         with self._active_lock:
             self._active_metadata_processes.discard(process)
 
@@ -1879,7 +2188,8 @@ class DownloadService:
         if not key:
             return
         with self._active_lock:
-            self._paused_job_ids.add(key)
+            if self._job_interrupts.get(key) != DownloadState.CANCELLED.value:
+                self._job_interrupts[key] = DownloadState.PAUSED.value
             process = self._active_job_processes.get(key)
         if process is not None:
             self._kill_process_tree(process)
@@ -1890,7 +2200,8 @@ class DownloadService:
         if not key:
             return
         with self._active_lock:
-            self._paused_job_ids.discard(key)
+            if self._job_interrupts.get(key) == DownloadState.PAUSED.value:
+                del self._job_interrupts[key]
         self._notify_control_changed()
 
     def stop_job(self, job_id: str) -> None:
@@ -1898,34 +2209,24 @@ class DownloadService:
         if not key:
             return
         with self._active_lock:
-            self._stopped_job_ids.add(key)
-            self._paused_job_ids.discard(key)
+            self._job_interrupts[key] = DownloadState.CANCELLED.value
             process = self._active_job_processes.get(key)
         if process is not None:
             self._kill_process_tree(process)
         self._notify_control_changed()
 
-    def _is_job_paused(self, job_id: str) -> bool:
-        key = str(job_id or "").strip()
-        if not key:
-            return False
-        with self._active_lock:
-            return key in self._paused_job_ids
+    def _job_interrupt(self, job_id: str) -> str | None:
+        return self._job_interrupts.get(str(job_id or "").strip())
 
     def _is_job_stopped(self, job_id: str) -> bool:
-        key = str(job_id or "").strip()
-        if not key:
-            return False
-        with self._active_lock:
-            return key in self._stopped_job_ids
+        return self._job_interrupt(job_id) == DownloadState.CANCELLED.value
 
     def cancel_all(self) -> None:
         with self._active_lock:
             running = list(self._active_processes)
             self._active_processes.clear()
             self._active_job_processes.clear()
-            self._paused_job_ids.clear()
-            self._stopped_job_ids.clear()
+            self._job_interrupts.clear()
         for process in running:
             self._kill_process_tree(process)
         self._notify_control_changed()
@@ -1939,11 +2240,12 @@ class DownloadService:
         self._notify_control_changed()
 
     def _resolve_interrupt_state(self, job_id: str, cancel_token: threading.Event) -> str | None:
-        if cancel_token.is_set() or self._is_job_stopped(job_id):
+        return self._interrupt_state_for_key(str(job_id or "").strip(), cancel_token)
+
+    def _interrupt_state_for_key(self, job_key: str, cancel_token: threading.Event) -> str | None:
+        if cancel_token.is_set():
             return DownloadState.CANCELLED.value
-        if self._is_job_paused(job_id):
-            return DownloadState.PAUSED.value
-        return None
+        return self._job_interrupts.get(job_key)
 
     @staticmethod
     def _make_result(
@@ -1967,6 +2269,8 @@ class DownloadService:
             return clean_line.split("Destination:", 1)[1].strip()
         if "Merging formats into" in clean_line:
             return clean_line.split("Merging formats into", 1)[1].strip().strip('"')
+        if clean_line.startswith("["):
+            return ""
         candidate = str(clean_line or "").strip().strip('"')
         lowered = candidate.lower()
         if (
@@ -1996,12 +2300,16 @@ class DownloadService:
         output_path: str,
         saw_already_downloaded: bool,
     ) -> tuple[str, str, bool, str]:
-        clean = sanitize_error_text(line)
+        if isinstance(line, str) and line.isprintable():
+            clean = line.strip()
+        else:
+            clean = sanitize_error_text(line)
         if not clean:
             return last_error, output_path, saw_already_downloaded, ""
-        if log_cb and _is_important_log_line(clean):
+        lowered = clean.lower()
+        if log_cb and _IMPORTANT_LOG_RE.search(lowered) is not None:
             log_cb(clean)
-        if "has already been downloaded" in clean.lower():
+        if "has already been downloaded" in lowered:
             saw_already_downloaded = True
         candidate_path = self._parse_output_path_from_line(clean)
         if candidate_path:
@@ -2106,16 +2414,12 @@ class DownloadService:
         saw_already_downloaded = False
         post_processing_notified = False
         try:
-            creationflags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                bufsize=1,
-                creationflags=creationflags,
+                bufsize=0,
+                **_subprocess_spawn_kwargs(),
             )
         except Exception as exc:
             discard_partial_candidates(output_template_for_part_tracking)
@@ -2128,8 +2432,10 @@ class DownloadService:
                 return self._make_result(job, state=DownloadState.ERROR.value, error="No output stream")
 
             progress_estimator = _TransferRateEstimator()
-            for line in iter(stream.readline, ""):
-                interrupt_state = self._resolve_interrupt_state(job.job_id, cancel_token)
+            progress_throttle = _ProgressThrottle()
+            job_key = str(job.job_id or "").strip()
+            for line in _iter_pipe_lines(stream, idle_timeout=_PIPE_IDLE_POLL_SECONDS):
+                interrupt_state = self._interrupt_state_for_key(job_key, cancel_token)
                 if interrupt_state == DownloadState.CANCELLED.value:
                     self._kill_process_tree(process)
                     return self._make_result(job, state=DownloadState.CANCELLED.value, output_path=output_path)
@@ -2137,6 +2443,15 @@ class DownloadService:
                     self._kill_process_tree(process)
                     return self._make_result(job, state=DownloadState.PAUSED.value, output_path=output_path)
 
+                if line.startswith(_PROGRESS_TEMPLATE_PREFIX):
+                    payload = _progress_payload_from_template_line(line)
+                    if payload is not None:
+                        if progress_cb is not None:
+                            percent = max(0.0, min(99.0, _progress_percent_from_payload(payload) or 0.0))
+                            if progress_throttle.ready(percent):
+                                progress_cb(percent, _progress_message_from_payload(payload, progress_estimator))
+                        continue
+
                 last_error, output_path, saw_already_downloaded, clean = self._consume_download_line(
                     line,
                     log_cb=log_cb,
@@ -2148,16 +2463,6 @@ class DownloadService:
                     post_processing_notified = True
                     if progress_cb:
                         progress_cb(99.0, "Post-processing...")
-                match = _PROGRESS_RE.search(clean)
-                if match and progress_cb:
-                    try:
-                        percent = float(match.group("percent"))
-                    except ValueError:
-                        percent = 0.0
-                    progress_cb(
-                        max(0.0, min(99.0, percent)),
-                        _progress_message_from_download_line(clean, progress_estimator),
-                    )
 
             return_code = process.wait()
             interrupt_state = self._resolve_interrupt_state(job.job_id, cancel_token)
@@ -2240,13 +2545,12 @@ class DownloadService:
         speed_limit_kbps: int = 0,
     ) -> DownloadResult:
         try:
-            from yt_dlp import YoutubeDL
+            YoutubeDL = _youtube_dl_class()
         except Exception as exc:
             return self._make_result(job, state=DownloadState.ERROR.value, error=str(exc))
 
-        output_dir = Path(job.output_dir).expanduser().resolve()
         try:
-            output_dir.mkdir(parents=True, exist_ok=True)
+            output_dir = self._resolve_output_dir(job.output_dir)
         except Exception as exc:
             return self._make_result(job, state=DownloadState.ERROR.value, error=str(exc))
 
@@ -2309,9 +2613,11 @@ class DownloadService:
 
         logger = _YdlLogger()
         progress_estimator = _TransferRateEstimator()
+        progress_throttle = _ProgressThrottle()
+        job_key = str(job.job_id or "").strip()
 
         def progress_hook(payload: dict[str, Any]) -> None:
-            interrupt_state = self._resolve_interrupt_state(job.job_id, cancel_token)
+            interrupt_state = self._interrupt_state_for_key(job_key, cancel_token)
             if interrupt_state == DownloadState.CANCELLED.value:
                 raise _InProcessCancelled(_INPROCESS_CANCELLED_SENTINEL)
             if interrupt_state == DownloadState.PAUSED.value:
@@ -2327,27 +2633,22 @@ class DownloadService:
                 return
 
             percent = _progress_percent_from_payload(payload)
+            if not progress_throttle.ready(percent or 0.0):
+                return
             line = _progress_message_from_payload(payload, progress_estimator)
             progress_cb(max(0.0, min(99.0, percent or 0.0)), line)
 
         ydl_opts: dict[str, Any] = {
-            "newline": True,
-            "noplaylist": True,
-            "no_warnings": True,
-            "quiet": True,
+            **_BASE_INPROCESS_YDL_OPTS,
             "format": selector,
             "outtmpl": output_template,
             "progress_hooks": [progress_hook],
             "logger": logger,
         }
 
-        ffmpeg_path = resolve_binary("ffmpeg")
-        choice = str(job.format_choice or "").strip().upper()
-        needs_conversion = (
-            (is_audio_format_choice(choice) and choice != FormatChoice.AUDIO.value)
-            or choice in CONVERSION_CONTAINER_CHOICES
-        )
-        if needs_conversion and not ffmpeg_path:
+        ffmpeg_path = self._ffmpeg_path()
+        choice = _normalize_format_choice(job.format_choice)
+        if _format_choice_needs_conversion(choice) and not ffmpeg_path:
             return self._make_result(
                 job,
                 state=DownloadState.ERROR.value,
@@ -2361,9 +2662,9 @@ class DownloadService:
             )
         if ffmpeg_path:
             ydl_opts["ffmpeg_location"] = ffmpeg_path
-        js_runtimes = _yt_dlp_js_runtime_api_options()
-        if js_runtimes:
-            ydl_opts["js_runtimes"] = js_runtimes
+        node_path = self._node_runtime_path()
+        if node_path:
+            ydl_opts["js_runtimes"] = {"node": {"path": node_path}}
 
         if normalized_conflict_policy == "overwrite":
             ydl_opts["overwrites"] = True
@@ -2375,20 +2676,14 @@ class DownloadService:
             ydl_opts["ratelimit"] = rate_limit * 1024
 
         postprocessors: list[dict[str, Any]] = []
-        if choice == FormatChoice.MP3.value:
-            postprocessors.append(
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "0",
-                }
-            )
+        if choice == _MP3_CHOICE:
+            postprocessors.append(dict(_MP3_POSTPROCESSOR))
         if save_metadata_to_file:
-            postprocessors.append({"key": "FFmpegMetadata"})
+            postprocessors.append(dict(_METADATA_POSTPROCESSOR))
         if postprocessors:
             ydl_opts["postprocessors"] = postprocessors
 
-        if choice == FormatChoice.MP4.value:
+        if choice == _MP4_CHOICE:
             ydl_opts["merge_output_format"] = "mp4"
         elif choice in CONVERSION_CONTAINER_CHOICES:
             ydl_opts["merge_output_format"] = choice.lower()
@@ -2534,18 +2829,30 @@ class DownloadService:
             speed_limit_kbps=speed_limit_kbps,
         )
 
-    @staticmethod
+    def _batch_put(self, jobs_queue: deque[object], item: object) -> None:
+        with self._batch_condition:
+            jobs_queue.append(item)
+            self._batch_condition.notify()
+
     def _batch_take_next_item(
-        jobs_queue: queue.Queue[object],
+        self,
+        jobs_queue: deque[object],
         *,
         stop_sentinel: object,
     ) -> tuple[DownloadJob | None, bool]:
-        current_item = jobs_queue.get()
+        try:
+            current_item = jobs_queue.popleft()
+        except IndexError:
+            with self._batch_condition:
+                while True:
+                    try:
+                        current_item = jobs_queue.popleft()
+                        break
+                    except IndexError:
+                        self._batch_condition.wait()
         if current_item is stop_sentinel:
-            jobs_queue.task_done()
             return None, True
         if not isinstance(current_item, DownloadJob):
-            jobs_queue.task_done()
             return None, False
         return current_item, False
 
@@ -2555,30 +2862,23 @@ class DownloadService:
         job: DownloadJob,
         cancel_token: threading.Event,
         status_cb: StatusCallback | None,
-        jobs_queue: queue.Queue[object],
+        jobs_queue: deque[object],
     ) -> tuple[DownloadResult | None, bool]:
         interrupt_state = self._resolve_interrupt_state(job.job_id, cancel_token)
-        if interrupt_state == DownloadState.CANCELLED.value:
+        if interrupt_state == _STATE_CANCELLED:
             return (
                 DownloadResult(
                     job_id=job.job_id,
                     url=job.url,
-                    state=DownloadState.CANCELLED.value,
+                    state=_STATE_CANCELLED,
                 ),
                 True,
             )
-        if interrupt_state == DownloadState.PAUSED.value:
+        if interrupt_state == _STATE_PAUSED:
             if status_cb:
-                status_cb(job.job_id, DownloadState.PAUSED.value)
-            jobs_queue.put(job)
-            return (
-                DownloadResult(
-                    job_id=job.job_id,
-                    url=job.url,
-                    state=DownloadState.PAUSED.value,
-                ),
-                False,
-            )
+                status_cb(job.job_id, _STATE_PAUSED)
+            self._batch_put(jobs_queue, job)
+            return None, False
         return None, True
 
     def _batch_run_single_attempt(
@@ -2620,7 +2920,7 @@ class DownloadService:
         self,
         *,
         job: DownloadJob,
-        jobs_queue: queue.Queue[object],
+        jobs_queue: deque[object],
         cancel_token: threading.Event,
         progress_cb: BatchProgressCallback | None,
         status_cb: StatusCallback | None,
@@ -2632,9 +2932,10 @@ class DownloadService:
         conflict_policy: str,
         save_metadata_to_file: bool,
         speed_limit_kbps: int,
-    ) -> tuple[DownloadResult, bool, int]:
-        result = DownloadResult(job_id=job.job_id, url=job.url, state=DownloadState.ERROR.value)
+    ) -> tuple[DownloadResult | None, bool, int]:
+        job_key = str(job.job_id or "").strip()
         attempt = 0
+        retry_delay = 0.0
         retried_attempts_increment = 0
         while True:
             interrupt_result, count_as_complete = self._batch_interrupt_or_requeue(
@@ -2643,10 +2944,10 @@ class DownloadService:
                 status_cb=status_cb,
                 jobs_queue=jobs_queue,
             )
-            if interrupt_result is not None:
+            if interrupt_result is not None or not count_as_complete:
                 return interrupt_result, count_as_complete, retried_attempts_increment
             if status_cb:
-                status_cb(job.job_id, DownloadState.DOWNLOADING.value)
+                status_cb(job.job_id, _STATE_DOWNLOADING)
             result = self._batch_run_single_attempt(
                 job=job,
                 cancel_token=cancel_token,
@@ -2658,34 +2959,26 @@ class DownloadService:
                 save_metadata_to_file=save_metadata_to_file,
                 speed_limit_kbps=speed_limit_kbps,
             )
-            if result.state == DownloadState.PAUSED.value:
+            if result.state == _STATE_PAUSED:
                 if status_cb:
-                    status_cb(job.job_id, DownloadState.PAUSED.value)
-                jobs_queue.put(job)
-                return (
-                    DownloadResult(
-                        job_id=job.job_id,
-                        url=job.url,
-                        state=DownloadState.PAUSED.value,
-                    ),
-                    False,
-                    retried_attempts_increment,
-                )
+                    status_cb(job.job_id, _STATE_PAUSED)
+                self._batch_put(jobs_queue, job)
+                return result, False, retried_attempts_increment
             should_retry = (
-                (not cancel_token.is_set())
-                and (not self._is_job_stopped(job.job_id))
-                and result.state == DownloadState.ERROR.value
-                and is_retryable_error(result.error)
+                result.state == _STATE_ERROR
                 and attempt < max_retries
+                and self._interrupt_state_for_key(job_key, cancel_token) != _STATE_CANCELLED
+                and is_retryable_error(result.error)
             )
             if not should_retry:
                 return result, True, retried_attempts_increment
             attempt += 1
             if status_cb:
-                status_cb(job.job_id, DownloadState.RETRYING.value)
+                status_cb(job.job_id, _STATE_RETRYING)
             retry_delay = retry_backoff_seconds(
                 attempt_index=attempt,
                 retry_profile=normalized_retry_profile,
+                previous_delay=retry_delay,
             )
             if log_cb:
                 log_cb(f"[{job.job_id}] retry {attempt}/{max_retries} in {retry_delay:.2f}s")
@@ -2694,66 +2987,46 @@ class DownloadService:
                 cancel_token=cancel_token,
                 job_id=job.job_id,
             )
-            if interrupt_state == DownloadState.CANCELLED.value:
-                return (
-                    DownloadResult(
-                        job_id=job.job_id,
-                        url=job.url,
-                        state=DownloadState.CANCELLED.value,
-                    ),
-                    True,
-                    retried_attempts_increment,
-                )
-            if interrupt_state == DownloadState.PAUSED.value:
+            if interrupt_state == _STATE_CANCELLED:
+                result.state = _STATE_CANCELLED
+                result.output_path = ""
+                result.error = ""
+                return result, True, retried_attempts_increment
+            if interrupt_state == _STATE_PAUSED:
                 if status_cb:
-                    status_cb(job.job_id, DownloadState.PAUSED.value)
-                jobs_queue.put(job)
-                return (
-                    DownloadResult(
-                        job_id=job.job_id,
-                        url=job.url,
-                        state=DownloadState.PAUSED.value,
-                    ),
-                    False,
-                    retried_attempts_increment,
-                )
+                    status_cb(job.job_id, _STATE_PAUSED)
+                self._batch_put(jobs_queue, job)
+                return None, False, retried_attempts_increment
             retried_attempts_increment += 1
 
     def _batch_complete_job(
         self,
         *,
         count_as_complete: bool,
-        jobs_queue: queue.Queue[object],
+        jobs_queue: deque[object],
         stop_sentinel: object,
         max_workers: int,
     ) -> int:
-        pending_after_complete = -1
-        if count_as_complete:
-            with self._batch_lock:
-                self._active_batch_pending_jobs = max(0, self._active_batch_pending_jobs - 1)
-                pending_after_complete = self._active_batch_pending_jobs
-        if pending_after_complete == 0:
-            with self._batch_lock:
+        if not count_as_complete:
+            return -1
+        with self._batch_condition:
+            self._active_batch_pending_jobs = max(0, self._active_batch_pending_jobs - 1)
+            pending_after_complete = self._active_batch_pending_jobs
+            if pending_after_complete == 0:
                 self._active_batch_accepting = False
-            for _ in range(max_workers):
-                jobs_queue.put(stop_sentinel)
+                jobs_queue.extend([stop_sentinel] * max_workers)
+                self._batch_condition.notify_all()
+        if pending_after_complete == 0:
             self._notify_control_changed()
         return pending_after_complete
 
-    @staticmethod
-    def _batch_store_result(
+    def _batch_wait_for_control_change(
+        self,
         *,
-        ordered_results: dict[str, DownloadResult],
-        ordered_results_lock: threading.Lock,
-        job_id: str,
-        result: DownloadResult,
+        cancel_token: threading.Event,
+        last_seen: int,
     ) -> None:
-        with ordered_results_lock:
-            ordered_results[job_id] = result
-
-    def _batch_wait_for_control_change(self, *, cancel_token: threading.Event) -> None:
         with self._control_condition:
-            last_seen = self._control_change_counter
             while not cancel_token.is_set() and self._control_change_counter == last_seen:
                 self._control_condition.wait(timeout=5.0)
 
@@ -2777,27 +3050,25 @@ class DownloadService:
         if not jobs:
             return DownloadSummary(total=0, completed=0, failed=0, skipped=0, cancelled=0, retried=0, results=[])
 
-        job_ids = {str(job.job_id or "").strip() for job in jobs if str(job.job_id or "").strip()}
+        normalized_job_ids = [str(job.job_id or "").strip() for job in jobs]
+        job_ids = {job_id for job_id in normalized_job_ids if job_id}
         with self._active_lock:
-            self._stopped_job_ids.difference_update(job_ids)
-            self._paused_job_ids.difference_update(job_ids)
+            for key in job_ids:
+                self._job_interrupts.pop(key, None)
+        self._reset_batch_caches()
 
-        max_workers = max(1, min(int(concurrency), len(jobs)))
+        max_workers = max(1, min(int(concurrency), len(jobs), BATCH_CONCURRENCY_MAX))
         normalized_retry_profile = normalize_retry_profile(retry_profile)
         max_retries = retry_limit_for_profile(
             retry_count=max(0, int(retry_count)),
             retry_profile=normalized_retry_profile,
         )
         ordered_results: dict[str, DownloadResult] = {}
-        ordered_results_lock = threading.Lock()
-        retried_attempts_counter = [0]
-        retried_attempts_lock = threading.Lock()
         stop_sentinel = object()
-        jobs_queue: queue.Queue[object] = queue.Queue()
+        jobs_queue: deque[object] = deque(jobs)
         for job in jobs:
-            jobs_queue.put(job)
             if status_cb:
-                status_cb(job.job_id, DownloadState.QUEUED.value)
+                status_cb(job.job_id, _STATE_QUEUED)
 
         with self._batch_lock:
             self._active_batch_queue = jobs_queue
@@ -2805,14 +3076,15 @@ class DownloadService:
             self._active_batch_status_cb = status_cb
             self._active_batch_accepting = True
 
-        def worker_loop() -> None:
+        def worker_loop() -> int:
+            retried_attempts = 0
             while True:
                 current, should_stop = self._batch_take_next_item(jobs_queue, stop_sentinel=stop_sentinel)
                 if should_stop:
-                    return
+                    return retried_attempts
                 if current is None:
                     continue
-                result = DownloadResult(job_id="", url="", state=DownloadState.ERROR.value)
+                result: DownloadResult | None = None
                 count_as_complete = True
                 try:
                     result, count_as_complete, retried_increment = self._batch_run_with_retries(
@@ -2830,9 +3102,7 @@ class DownloadService:
                         save_metadata_to_file=save_metadata_to_file,
                         speed_limit_kbps=speed_limit_kbps,
                     )
-                    if retried_increment > 0:
-                        with retried_attempts_lock:
-                            retried_attempts_counter[0] += retried_increment
+                    retried_attempts += retried_increment
                 except Exception as exc:
                     safe_job_id = current.job_id
                     safe_job_url = current.url
@@ -2840,14 +3110,13 @@ class DownloadService:
                     result = DownloadResult(
                         job_id=safe_job_id,
                         url=safe_job_url,
-                        state=DownloadState.ERROR.value,
+                        state=_STATE_ERROR,
                         error=safe_error,
                     )
                     if log_cb:
                         prefix = f"[{safe_job_id}] " if safe_job_id else ""
                         log_cb(f"{prefix}ERROR: {safe_error}")
                 finally:
-                    jobs_queue.task_done()
                     self._batch_complete_job(
                         count_as_complete=count_as_complete,
                         jobs_queue=jobs_queue,
@@ -2856,24 +3125,24 @@ class DownloadService:
                     )
 
                 if not count_as_complete:
-                    if self._resolve_interrupt_state(current.job_id, cancel_token) == DownloadState.PAUSED.value:
-                        self._batch_wait_for_control_change(cancel_token=cancel_token)
+                    control_generation = self._control_change_counter
+                    if self._resolve_interrupt_state(current.job_id, cancel_token) == _STATE_PAUSED:
+                        self._batch_wait_for_control_change(
+                            cancel_token=cancel_token,
+                            last_seen=control_generation,
+                        )
                     continue
 
-                self._batch_store_result(
-                    ordered_results=ordered_results,
-                    ordered_results_lock=ordered_results_lock,
-                    job_id=current.job_id,
-                    result=result,
-                )
+                if result is None:
+                    continue
+                ordered_results[current.job_id] = result
                 if status_cb:
                     status_cb(current.job_id, normalize_download_state(result.state))
 
-        workers: list[concurrent.futures.Future[None]] = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for _ in range(max_workers):
-                workers.append(executor.submit(worker_loop))
-            concurrent.futures.wait(workers)
+        executor = self._shared_batch_pool()
+        workers = [executor.submit(worker_loop) for _ in range(max_workers)]
+        concurrent.futures.wait(workers)
+        retried_attempts_total = sum(worker.result() for worker in workers if worker.exception() is None)
 
         with self._batch_lock:
             self._active_batch_accepting = False
@@ -2882,51 +3151,35 @@ class DownloadService:
             self._active_batch_status_cb = None
 
         with self._active_lock:
-            self._stopped_job_ids.difference_update(job_ids)
-            self._paused_job_ids.difference_update(job_ids)
+            for key in job_ids:
+                self._job_interrupts.pop(key, None)
 
         results: list[DownloadResult] = []
         seen_job_ids: set[str] = set()
-        for job in jobs:
-            job_id = str(job.job_id or "").strip()
+        for job, job_id in zip(jobs, normalized_job_ids):
             if (not job_id) or (job_id in seen_job_ids):
                 continue
-            item = ordered_results.get(job_id)
-            if item is None:
-                continue
             seen_job_ids.add(job_id)
-            results.append(item)
-        for job in jobs:
-            job_id = str(job.job_id or "").strip()
-            if (not job_id) or (job_id in seen_job_ids):
-                continue
-            seen_job_ids.add(job_id)
-            fallback_state = DownloadState.CANCELLED.value if (cancel_token.is_set() or self._is_job_stopped(job_id)) else DownloadState.ERROR.value
-            fallback_error = "" if fallback_state == DownloadState.CANCELLED.value else "Internal error: result missing for job."
-            results.append(
-                DownloadResult(
+            item = ordered_results.pop(job_id, None)
+            if item is None:
+                fallback_state = _STATE_CANCELLED if (cancel_token.is_set() or self._is_job_stopped(job_id)) else _STATE_ERROR
+                fallback_error = "" if fallback_state == _STATE_CANCELLED else "Internal error: result missing for job."
+                item = DownloadResult(
                     job_id=job_id,
                     url=str(job.url or ""),
                     state=fallback_state,
                     error=fallback_error,
                 )
-            )
-        for job_id, item in ordered_results.items():
-            if job_id in seen_job_ids:
-                continue
-            seen_job_ids.add(job_id)
             results.append(item)
-        completed = sum(1 for item in results if item.state == DownloadState.DONE.value)
-        skipped = sum(1 for item in results if item.state == DownloadState.SKIPPED.value)
-        cancelled = sum(1 for item in results if item.state == DownloadState.CANCELLED.value)
-        failed = sum(1 for item in results if item.state == DownloadState.ERROR.value)
+        results.extend(ordered_results.values())
+        state_counts = Counter(item.state for item in results)
         return DownloadSummary(
             total=len(results),
-            completed=completed,
-            failed=failed,
-            skipped=skipped,
-            cancelled=cancelled,
-            retried=retried_attempts_counter[0],
+            completed=state_counts[_STATE_DONE],
+            failed=state_counts[_STATE_ERROR],
+            skipped=state_counts[_STATE_SKIPPED],
+            cancelled=state_counts[_STATE_CANCELLED],
+            retried=retried_attempts_total,
             results=results,
         )
 
@@ -2976,3 +3229,5 @@ def run_metadata_worker_cli(argv: list[str] | None = None) -> int:
         envelope = {"ok": False, "result": None, "error": sanitize_error_text(exc)}
         sys.stdout.write(json.dumps(envelope, separators=(",", ":")))
         return 1
+    finally:
+        service.close()
@@ -1,23 +1,23 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 
 def format_size_human(size_bytes: int | None) -> str:
     if size_bytes is None:
         return "Unknown"
     try:
-        value = float(int(size_bytes))
+        size = int(size_bytes)
     except Exception:
         return "Unknown"
-    if value <= 0:
+    if size <= 0:
         return "Unknown"
-    units = ("B", "KB", "MB", "GB", "TB")
-    unit_index = 0
-    while value >= 1024.0 and unit_index < (len(units) - 1):
-        value /= 1024.0
-        unit_index += 1
+    unit_index = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
     if unit_index == 0:
-        return f"{int(value)} {units[unit_index]}"
-    return f"{value:.2f} {units[unit_index]}"
+        return f"{size} B"
+    return f"{size / (1 << (unit_index * 10)):.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def format_batch_stats_line(
@@ -30,6 +30,20 @@ def format_batch_stats_line(
     invalid: int,
     pending: int,
     duplicates: int,
+) -> str:
+    return _format_batch_stats_line(queued, downloading, in_progress, downloaded, valid, invalid, pending, duplicates)
+
+
+@lru_cache(maxsize=256)
+def _format_batch_stats_line(
+    queued: int,
+    downloading: int,
+    in_progress: int,
+    downloaded: int,
+    valid: int,
+    invalid: int,
+    pending: int,
+    duplicates: int,
 ) -> str:
     return (
         f"Downloaded: {int(downloaded)}  |  Downloading: {int(downloading)}"
@@ -73,9 +73,14 @@ _AUDIO_ONLY_FORMAT_CHOICES = frozenset(
 
 
 def is_audio_format_choice(value: str) -> bool:
-    normalized = str(value or "").strip().upper()
-    if not normalized:
+    if not value:
         return False
+    if isinstance(value, str):
+        if value in _AUDIO_ONLY_FORMAT_CHOICES:
+            return True
+        normalized = value.strip().upper()
+    else:
+        normalized = str(value).strip().upper()
     return normalized in _AUDIO_ONLY_FORMAT_CHOICES
 
 
@@ -110,7 +115,7 @@ DEFAULT_QUALITY_CHOICES: tuple[str, ...] = (
 )
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     schema_version: int
     theme_mode: str
@@ -63,12 +63,7 @@ def resolve_app_asset(asset_name: str) -> Path | None:
     name = str(asset_name or "").strip()
     if not name:
         return None
-    search_bases: list[Path] = []
-    bundle_base = bundle_dir()
-    if bundle_base is not None:
-        search_bases.append(bundle_base)
-    search_bases.append(app_dir())
-    for base in _unique_paths(search_bases):
+    for base in _asset_search_dirs():
         candidate = base / name
         if candidate.is_file():
             return candidate
@@ -81,6 +76,21 @@ def _binary_name_candidates(binary_name: str) -> list[str]:
     return [binary_name]
 
 
+@lru_cache(maxsize=1)
+def _asset_search_dirs() -> tuple[Path, ...]:
+    search_bases: list[Path] = []
+    bundle_base = bundle_dir()
+    if bundle_base is not None:
+        search_bases.append(bundle_base)
+    search_bases.append(app_dir())
+    return tuple(_unique_paths(search_bases))
+
+
+@lru_cache(maxsize=1)
+def _binary_search_dirs() -> tuple[Path, ...]:
+    return tuple(_unique_paths([runtime_storage_dir(), app_dir(), appdata_dir()]))
+
+
 def _unique_paths(paths: list[Path]) -> list[Path]:
     seen: set[Path] = set()
     unique: list[Path] = []
@@ -95,8 +105,7 @@ def _unique_paths(paths: list[Path]) -> list[Path]:
 
 def resolve_binary(binary_name: str) -> str | None:
     names = _binary_name_candidates(binary_name)
-    search_dirs = _unique_paths([runtime_storage_dir(), app_dir(), appdata_dir()])
-    for base in search_dirs:
+    for base in _binary_search_dirs():
         for name in names:
             candidate = base / name
             if candidate.is_file():
@@ -11,6 +11,7 @@ import tempfile
 import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from threading import Event
 from urllib.parse import urlparse
@@ -23,21 +24,25 @@ except Exception:  # pragma: no cover - non-Windows
 
 _SEMVER_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
 _SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
-_MANIFEST_ALLOWED_HOSTS = {
-    "justagwas.com",
-    "www.justagwas.com",
-}
-_UPDATE_ALLOWED_HOSTS = {
-    "github.com",
-    "www.github.com",
-    "sourceforge.net",
-    "www.sourceforge.net",
-    "justagwas.com",
-    "www.justagwas.com",
-    "downloads.justagwas.com",
-    "objects.githubusercontent.com",
-    "github-releases.githubusercontent.com",
-}
+_MANIFEST_ALLOWED_HOSTS = frozenset(
+    {
+        "justagwas.com",
+        "www.justagwas.com",
+    }
+)
+_UPDATE_ALLOWED_HOSTS = frozenset(
+    {
+        "github.com",
+        "www.github.com",
+        "sourceforge.net",
+        "www.sourceforge.net",
+        "justagwas.com",
+        "www.justagwas.com",
+        "downloads.justagwas.com",
+        "objects.githubusercontent.com",
+        "github-releases.githubusercontent.com",
+    }
+)
 _VALID_UPDATE_CHANNELS = {"stable", "nightly"}
 _REQUEST_RETRIES = 3
 _REQUEST_RETRY_DELAY_SECONDS = 0.5
@@ -47,15 +52,24 @@ _MANIFEST_MAX_BYTES = 1024 * 1024
 _InstallProgressCallback = Callable[[int, str], None]
 
 
+@lru_cache(maxsize=256)
 def normalize_version(version_text: str) -> str:
-    text = str(version_text or "").strip()
-    if text.lower().startswith("v"):
+    if isinstance(version_text, str):
+        text = version_text.strip()
+    else:
+        text = str(version_text or "").strip()
+    if text[:1] in ("v", "V"):
         text = text[1:]
     return text
 
 
+@lru_cache(maxsize=256)
 def parse_semver(value: str) -> tuple[int, int, int] | None:
-    match = _SEMVER_RE.search(str(value or ""))
+    if isinstance(value, str):
+        text = value
+    else:
+        text = str(value or "")
+    match = _SEMVER_RE.search(text)
     if not match:
         return None
     return int(match.group(1)), int(match.group(2)), int(match.group(3))
@@ -93,17 +107,22 @@ def _sanitize_notes(value: object) -> list[str]:
     return notes
 
 
-def _url_allowed(url_text: str, *, allowed_hosts: set[str]) -> bool:
-    parsed = urlparse(str(url_text or "").strip())
+@lru_cache(maxsize=64)
+def _https_url_host(url_text: str) -> str:
+    parsed = urlparse(url_text)
     if parsed.scheme.lower() != "https":
-        return False
-    host = str(parsed.hostname or "").strip().lower()
+        return ""
+    return parsed.hostname or ""
+
+
+def _url_allowed(url_text: str, *, allowed_hosts: frozenset[str]) -> bool:
+    host = _https_url_host(str(url_text or "").strip())
     if not host:
         return False
     return host in allowed_hosts
 
 
-def _sanitize_url(url_text: object, *, allowed_hosts: set[str]) -> str:
+def _sanitize_url(url_text: object, *, allowed_hosts: frozenset[str]) -> str:
     candidate = str(url_text or "").strip()
     if candidate and _url_allowed(candidate, allowed_hosts=allowed_hosts):
         return candidate
@@ -256,7 +275,7 @@ class SelfUpdater:
             setup_sha256=manifest.setup_sha256,
             setup_size=manifest.setup_size,
             released=manifest.released,
-            notes=list(manifest.notes),
+            notes=manifest.notes,
             source="latest.json",
             channel=manifest.channel,
             minimum_supported_version=minimum_supported,
@@ -360,12 +379,12 @@ class SelfUpdater:
     def _fetch_manifest(self, *, stop_event: Event | None = None) -> UpdateManifest:
         if not _url_allowed(self._manifest_url, allowed_hosts=_MANIFEST_ALLOWED_HOSTS):
             raise RuntimeError("Manifest URL is missing or untrusted.")
-        payload, _ = self._request_text(
+        payload, _ = self._request_payload(
             self._manifest_url,
             stop_event=stop_event,
             allowed_hosts=_MANIFEST_ALLOWED_HOSTS,
         )
-        data = json.loads(payload)
+        data = json.loads(payload.decode("utf-8-sig", errors="replace"))
         if not isinstance(data, dict):
             raise RuntimeError("latest.json did not return a JSON object")
 
@@ -436,13 +455,13 @@ class SelfUpdater:
             minimum_supported_version=minimum_supported,
         )
 
-    def _request_text(
+    def _request_payload(
         self,
         url: str,
         *,
         stop_event: Event | None = None,
-        allowed_hosts: set[str] | None = None,
-    ) -> tuple[str, str]:
+        allowed_hosts: frozenset[str] | None = None,
+    ) -> tuple[bytearray, str]:
         _ensure_not_stopped(stop_event)
         request = Request(
             url=url,
@@ -458,9 +477,8 @@ class SelfUpdater:
         final_allowed_hosts = allowed_hosts or _UPDATE_ALLOWED_HOSTS
         if not _url_allowed(final_url, allowed_hosts=final_allowed_hosts):
             raise RuntimeError("Update endpoint redirected to an untrusted host.")
-        body = payload.decode("utf-8-sig", errors="replace")
         _ensure_not_stopped(stop_event)
-        return body, final_url
+        return payload, final_url
 
     def _request_with_retries(
         self,
@@ -469,7 +487,7 @@ class SelfUpdater:
         timeout: float,
         stop_event: Event | None = None,
         max_bytes: int | None = None,
-    ) -> tuple[bytes, str]:
+    ) -> tuple[bytearray, str]:
         attempts = max(1, int(_REQUEST_RETRIES))
         timeout_seconds = max(0.1, float(timeout))
         delay_base = max(0.0, float(_REQUEST_RETRY_DELAY_SECONDS))
@@ -487,18 +505,15 @@ class SelfUpdater:
                             content_length = 0
                         if content_length > byte_limit:
                             raise RuntimeError("Update response exceeded the allowed size.")
-                    chunks: list[bytes] = []
-                    downloaded = 0
+                    payload = bytearray()
                     while True:
                         _ensure_not_stopped(stop_event)
                         chunk = response.read(64 * 1024)
                         if not chunk:
                             break
-                        downloaded += len(chunk)
-                        if byte_limit > 0 and downloaded > byte_limit:
+                        payload += chunk
+                        if byte_limit > 0 and len(payload) > byte_limit:
                             raise RuntimeError("Update response exceeded the allowed size.")
-                        chunks.append(chunk)
-                    payload = b"".join(chunks)
                     final_url = str(response.geturl() or request.full_url)
                 _ensure_not_stopped(stop_event)
                 return payload, final_url
@@ -541,14 +556,19 @@ class SelfUpdater:
                     if not _url_allowed(final_url, allowed_hosts=_UPDATE_ALLOWED_HOSTS):
                         raise RuntimeError("Update download redirected to an untrusted host.")
                     downloaded = 0
+                    digest = hashlib.sha256()
+                    buffer = bytearray(256 * 1024)
+                    buffer_view = memoryview(buffer)
                     with tmp_path.open("wb") as handle:
                         while True:
                             _ensure_not_stopped(stop_event)
-                            chunk = response.read(256 * 1024)
-                            if not chunk:
+                            read_size = response.readinto(buffer)
+                            if not read_size:
                                 break
+                            chunk = buffer_view[:read_size]
                             handle.write(chunk)
-                            downloaded += len(chunk)
+                            digest.update(chunk)
+                            downloaded += read_size
                             if expected_size > 0 and downloaded > expected_size:
                                 raise RuntimeError(
                                     f"Downloaded size exceeded expected setup size of {expected_size} bytes."
@@ -565,8 +585,7 @@ class SelfUpdater:
                 actual_size = tmp_path.stat().st_size
                 if actual_size != expected_size:
                     raise RuntimeError(f"Downloaded size mismatch. Expected {expected_size}, got {actual_size}.")
-                actual_sha256 = self._sha256_file(tmp_path)
-                if actual_sha256.lower() != sha256.lower():
+                if digest.hexdigest() != sha256.lower():
                     raise RuntimeError("SHA256 verification failed for downloaded setup installer.")
                 os.replace(tmp_path, destination)
                 _emit_install_progress(progress_cb, percent=94, message="Download complete.")
@@ -732,17 +751,6 @@ class SelfUpdater:
                         return "/CURRENTUSER"
         return None
 
-    @staticmethod
-    def _sha256_file(path: Path) -> str:
-        digest = hashlib.sha256()
-        with path.open("rb") as handle:
-            while True:
-                chunk = handle.read(256 * 1024)
-                if not chunk:
-                    break
-                digest.update(chunk)
-        return digest.hexdigest().lower()
-
     def _setup_filename_from_url(self, url: str, version: str) -> str:
         candidate = Path(urlparse(str(url or "").strip()).path).name
         if not candidate:
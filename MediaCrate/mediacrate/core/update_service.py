@@ -4,6 +4,7 @@ import os
 import sys
 import threading
 from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
 from threading import Event
 
@@ -27,6 +28,7 @@ from .self_updater import (
 )
 
 
+@lru_cache(maxsize=1)
 def _update_storage_root() -> Path:
     local_app_data = str(os.environ.get("LOCALAPPDATA") or "").strip()
     if local_app_data:
@@ -38,7 +40,7 @@ def _update_storage_root() -> Path:
 
 
 class UpdateService:
-    def __init__(self) -> None:
+    def __init__(self, *, defer_recovery: bool = True) -> None:
         executable_name = "MediaCrate.exe" if sys.platform == "win32" else "MediaCrate"
         self._updater = SelfUpdater(
             app_name=APP_NAME,
@@ -51,6 +53,16 @@ class UpdateService:
             install_dir=app_dir(),
             runtime_storage_dir=_update_storage_root(),
         )
+        self._recovery_lock = threading.Lock()
+        self._recovery_started = False
+        if not defer_recovery:
+            self.start_background_recovery()
+
+    def start_background_recovery(self) -> None:
+        with self._recovery_lock:
+            if self._recovery_started:
+                return
+            self._recovery_started = True
         try:
             threading.Thread(
                 target=self._updater.recover_pending_update,
@@ -60,6 +72,13 @@ class UpdateService:
         except Exception:
             self._updater.recover_pending_update()
 
+    def _ensure_recovered(self) -> None:
+        with self._recovery_lock:
+            if self._recovery_started:
+                return
+            self._recovery_started = True
+        self._updater.recover_pending_update()
+
     def check_for_updates(
         self,
         current_version: str,
@@ -82,7 +101,7 @@ class UpdateService:
             setup_sha256=str(check.setup_sha256 or ""),
             setup_size=int(check.setup_size or 0),
             released=str(check.released or ""),
-            notes=list(check.notes or []),
+            notes=check.notes or [],
             install_supported=bool(check.install_supported),
             channel=str(check.channel or "stable"),
             minimum_supported_version=str(check.minimum_supported_version or "1.0.0"),
@@ -102,6 +121,7 @@ class UpdateService:
             raise RuntimeError("No update is available.")
         if not check_result.setup_url:
             raise RuntimeError("No setup installer URL was provided.")
+        self._ensure_recovered()
 
         return self._updater.install_update(
             self._to_check_data(check_result),
@@ -120,6 +140,7 @@ class UpdateService:
             raise RuntimeError("No update is available.")
         if not check_result.setup_url:
             raise RuntimeError("No setup installer URL was provided.")
+        self._ensure_recovered()
         return self._updater.prepare_update(
             self._to_check_data(check_result),
             stop_event=stop_event,
@@ -151,7 +172,7 @@ class UpdateService:
             setup_sha256=str(result.setup_sha256 or ""),
             setup_size=int(result.setup_size or 0),
             released=str(result.released or ""),
-            notes=list(result.notes or []),
+            notes=result.notes or [],
             source=str(result.source or "latest.json"),
             channel=str(result.channel or "stable"),
             minimum_supported_version=str(result.minimum_supported_version or "1.0.0"),
@@ -4,8 +4,12 @@ from collections.abc import Iterator
 
 
 def iter_non_empty_lines(text: str) -> Iterator[str]:
-    for raw_line in str(text or "").splitlines():
-        value = str(raw_line or "").strip()
+    if not text:
+        return
+    if not isinstance(text, str):
+        text = str(text)
+    for raw_line in text.splitlines():
+        value = raw_line.strip()
         if value:
             yield value
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 
 from ..core.formatting import format_size_human
@@ -17,6 +18,32 @@ _RUNTIME_BATCH_STATUSES = frozenset(
         BatchEntryStatus.CANCELLED.value,
     }
 )
+_STATUS_LABELS = {
+    "duplicate": "Duplicate",
+    BatchEntryStatus.INVALID.value: "Invalid",
+    BatchEntryStatus.VALIDATING.value: "Checking",
+    BatchEntryStatus.VALID.value: "Ready",
+    BatchEntryStatus.DOWNLOAD_QUEUED.value: "Queued",
+    BatchEntryStatus.DOWNLOADING.value: "Downloading",
+    BatchEntryStatus.PAUSED.value: "Paused",
+    BatchEntryStatus.DONE.value: "Done",
+    BatchEntryStatus.SKIPPED.value: "Skipped",
+    BatchEntryStatus.FAILED.value: "Failed",
+    BatchEntryStatus.CANCELLED.value: "Cancelled",
+}
+_DEFAULT_STATUS_ACTIONS = ("default", False, "download", "Download")
+_STATUS_ACTIONS: dict[str, tuple[str, bool, str, str]] = {
+    BatchEntryStatus.INVALID.value: ("invalid", False, "download", "Download"),
+    BatchEntryStatus.VALIDATING.value: _DEFAULT_STATUS_ACTIONS,
+    BatchEntryStatus.VALID.value: ("default", True, "download", "Download"),
+    BatchEntryStatus.DOWNLOAD_QUEUED.value: ("default", True, "pause", "Pause"),
+    BatchEntryStatus.DOWNLOADING.value: ("default", True, "pause", "Pause"),
+    BatchEntryStatus.PAUSED.value: ("paused", True, "resume", "Resume"),
+    BatchEntryStatus.DONE.value: ("done", True, "download", "Download"),
+    BatchEntryStatus.SKIPPED.value: ("done", True, "download", "Download"),
+    BatchEntryStatus.FAILED.value: ("invalid", True, "download", "Retry"),
+    BatchEntryStatus.CANCELLED.value: ("default", True, "download", "Retry"),
+}
 
 
 @dataclass(frozen=True, slots=True)
@@ -40,142 +67,150 @@ class BatchEntryViewState:
     is_duplicate_visual: bool
     signature: tuple[object, ...]
 
+
+_VIEW_STATE_CACHE: dict[str, tuple[tuple[object, ...], BatchEntryViewState]] = {}
+
 def status_label_for_state(state: str) -> str:
-    mapping = {
-        "duplicate": "Duplicate",
-        BatchEntryStatus.INVALID.value: "Invalid",
-        BatchEntryStatus.VALIDATING.value: "Checking",
-        BatchEntryStatus.VALID.value: "Ready",
-        BatchEntryStatus.DOWNLOAD_QUEUED.value: "Queued",
-        BatchEntryStatus.DOWNLOADING.value: "Downloading",
-        BatchEntryStatus.PAUSED.value: "Paused",
-        BatchEntryStatus.DONE.value: "Done",
-        BatchEntryStatus.SKIPPED.value: "Skipped",
-        BatchEntryStatus.FAILED.value: "Failed",
-        BatchEntryStatus.CANCELLED.value: "Cancelled",
-    }
-    return mapping.get(str(state or "").strip().lower(), "Unknown")
+    return _STATUS_LABELS.get(str(state or "").strip().lower(), "Unknown")
+
+
+def _normalized_choice(value: object) -> str:
+    if not value:
+        return ""
+    return sys.intern(str(value).strip().upper())
+
+
+def _batch_entry_input_key(entry: BatchEntry) -> tuple[object, ...]:
+    return (
+        entry.entry_id,
+        entry.url_raw,
+        entry.thumbnail_url,
+        entry.status,
+        entry.is_duplicate,
+        entry.title,
+        entry.expected_size_bytes,
+        entry.format_choice,
+        entry.quality_choice,
+        entry.attempts,
+        entry.progress_percent,
+        getattr(entry, "transfer_eta", ""),
+        getattr(entry, "transfer_speed", ""),
+        entry.error,
+        tuple(entry.available_formats or ()),
+        tuple(entry.available_qualities or ()),
+    )
 
 
 def build_batch_entry_view_state(entry: BatchEntry) -> BatchEntryViewState:
-    normalized_status = str(entry.status or BatchEntryStatus.INVALID.value).strip().lower()
+    input_key = _batch_entry_input_key(entry)
+    cached = _VIEW_STATE_CACHE.get(entry.entry_id)
+    if cached is not None and cached[0] == input_key:
+        return cached[1]
+    view = _build_batch_entry_view_state(entry)
+    _VIEW_STATE_CACHE[entry.entry_id] = (input_key, view)
+    return view
+
+
+def prune_batch_entry_view_cache(valid_ids: set[str]) -> None:
+    stale_ids = [entry_id for entry_id in _VIEW_STATE_CACHE if entry_id not in valid_ids]
+    for entry_id in stale_ids:
+        del _VIEW_STATE_CACHE[entry_id]
+
+
+def _build_batch_entry_view_state(entry: BatchEntry) -> BatchEntryViewState:
+    normalized_status = sys.intern(str(entry.status or BatchEntryStatus.INVALID.value).strip().lower())
     status_state = normalized_status
     if bool(entry.is_duplicate) and normalized_status not in _RUNTIME_BATCH_STATUSES:
         status_state = "duplicate"
 
+    url_state, can_download, primary_action, primary_button_text = _STATUS_ACTIONS.get(
+        normalized_status,
+        _DEFAULT_STATUS_ACTIONS,
+    )
     if status_state == "duplicate":
         url_state = "duplicate"
-    elif normalized_status in {BatchEntryStatus.DONE.value, BatchEntryStatus.SKIPPED.value}:
-        url_state = "done"
-    elif normalized_status in {BatchEntryStatus.INVALID.value, BatchEntryStatus.FAILED.value}:
-        url_state = "invalid"
-    elif normalized_status == BatchEntryStatus.PAUSED.value:
-        url_state = "paused"
-    else:
-        url_state = "default"
 
-    formats = [
-        str(item or "").strip().upper()
-        for item in (entry.available_formats or [])
-        if str(item or "").strip()
-    ]
+    formats = [choice for choice in map(_normalized_choice, entry.available_formats or ()) if choice]
     if not formats:
         formats = list(DEFAULT_FORMAT_CHOICES)
-    explicit_format = str(entry.format_choice or "").strip().upper()
+    explicit_format = _normalized_choice(entry.format_choice)
     if explicit_format and explicit_format not in formats:
         formats.append(explicit_format)
     selected_format = explicit_format or "VIDEO"
     if selected_format not in formats:
         selected_format = "VIDEO" if "VIDEO" in formats else formats[0]
 
-    qualities = [
-        str(item or "").strip().upper()
-        for item in (entry.available_qualities or [])
-        if str(item or "").strip()
-    ]
+    qualities = [choice for choice in map(_normalized_choice, entry.available_qualities or ()) if choice]
     if not qualities:
         qualities = ["BEST QUALITY"]
     if "BEST QUALITY" not in qualities:
         qualities.insert(0, "BEST QUALITY")
-    selected_quality = str(entry.quality_choice or "BEST QUALITY").strip().upper() or "BEST QUALITY"
-    if is_audio_format_choice(selected_format) or selected_quality not in qualities:
-        selected_quality = "BEST QUALITY"
+    selected_quality = _normalized_choice(entry.quality_choice) or "BEST QUALITY"
     quality_allowed = not is_audio_format_choice(selected_format)
-
+    if not quality_allowed or selected_quality not in qualities:
+        selected_quality = "BEST QUALITY"
+    formats_tuple = tuple(formats)
+    qualities_tuple = tuple(qualities)
+
+    entry_id = str(entry.entry_id or "").strip()
+    full_url_text = str(entry.url_raw or "").strip()
+    thumbnail_url = str(entry.thumbnail_url or "").strip()
+    title = str(entry.title or "").strip()
+    error_text = str(entry.error or "").strip()
+    progress_percent = float(entry.progress_percent or 0.0)
+    if not progress_percent >= 0.0:
+        progress_percent = 0.0
+    elif progress_percent > 100.0:
+        progress_percent = 100.0
+    attempts = int(entry.attempts or 0)
+    if attempts < 0:
+        attempts = 0
     size_text = format_size_human(entry.expected_size_bytes)
-    title_text = str(entry.title or "").strip() or "Unknown title"
+    title_text = title or "Unknown title"
     transfer_eta = str(getattr(entry, "transfer_eta", "") or "").strip()
     transfer_speed = str(getattr(entry, "transfer_speed", "") or "").strip()
-    eta_text = transfer_eta or "--"
-    speed_text = transfer_speed or "--/s"
-    if transfer_speed and not transfer_speed.endswith("/s"):
-        speed_text = f"{transfer_speed}/s"
 
     if entry.error:
-        detail_text = (
-            f"{title_text}  |  "
-            f"Size: {size_text}  |  "
-            f"{entry.error}"
-        )
+        detail_text = f"{title_text}  |  Size: {size_text}  |  {entry.error}"
     else:
-        progress_text = f"Progress: {max(0.0, min(100.0, float(entry.progress_percent))):.2f}%"
-        progress_text = f"{progress_text}  |  ETA: {eta_text}  |  {speed_text}"
+        eta_text = transfer_eta or "--"
+        speed_text = transfer_speed or "--/s"
+        if transfer_speed and not transfer_speed.endswith("/s"):
+            speed_text = f"{transfer_speed}/s"
         detail_text = (
-            f"{title_text}"
-            f"  |  Size: {size_text}"
-            f"  |  {progress_text}"
-            f"  |  Attempts: {max(0, int(entry.attempts))}"
+            f"{title_text}  |  Size: {size_text}"
+            f"  |  Progress: {progress_percent:.2f}%  |  ETA: {eta_text}  |  {speed_text}"
+            f"  |  Attempts: {attempts}"
         )
 
-    can_download = normalized_status in {
-        BatchEntryStatus.VALID.value,
-        BatchEntryStatus.FAILED.value,
-        BatchEntryStatus.CANCELLED.value,
-        BatchEntryStatus.SKIPPED.value,
-        BatchEntryStatus.DONE.value,
-        BatchEntryStatus.DOWNLOADING.value,
-        BatchEntryStatus.DOWNLOAD_QUEUED.value,
-        BatchEntryStatus.PAUSED.value,
-    }
-    if normalized_status in {BatchEntryStatus.DOWNLOADING.value, BatchEntryStatus.DOWNLOAD_QUEUED.value}:
-        primary_action = "pause"
-        primary_button_text = "Pause"
-    elif normalized_status == BatchEntryStatus.PAUSED.value:
-        primary_action = "resume"
-        primary_button_text = "Resume"
-    else:
-        primary_action = "download"
-        is_retry = normalized_status in {BatchEntryStatus.FAILED.value, BatchEntryStatus.CANCELLED.value}
-        primary_button_text = "Retry" if is_retry else "Download"
-
     signature = (
-        str(entry.entry_id or "").strip(),
-        str(entry.url_raw or "").strip(),
-        str(entry.thumbnail_url or "").strip(),
+        entry_id,
+        full_url_text,
+        thumbnail_url,
         normalized_status,
         bool(entry.is_duplicate),
-        str(entry.title or "").strip(),
+        title,
         int(entry.expected_size_bytes) if entry.expected_size_bytes is not None else None,
         selected_format,
         selected_quality,
-        max(0, int(entry.attempts)),
-        round(max(0.0, min(100.0, float(entry.progress_percent))), 3),
+        attempts,
+        round(progress_percent, 3),
         transfer_eta,
         transfer_speed,
-        str(entry.error or "").strip(),
-        tuple(formats),
-        tuple(qualities),
+        error_text,
+        formats_tuple,
+        qualities_tuple,
     )
 
     return BatchEntryViewState(
-        entry_id=str(entry.entry_id or "").strip(),
-        full_url_text=str(entry.url_raw or "").strip(),
-        thumbnail_url=str(entry.thumbnail_url or "").strip(),
+        entry_id=entry_id,
+        full_url_text=full_url_text,
+        thumbnail_url=thumbnail_url,
         status_state=status_state,
         status_label=status_label_for_state(status_state),
         url_state=url_state,
-        formats=tuple(formats),
-        qualities=tuple(qualities),
+        formats=formats_tuple,
+        qualities=qualities_tuple,
         selected_format=selected_format,
         selected_quality=selected_quality,
         quality_allowed=quality_allowed,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QIcon, QPalette
@@ -9,14 +10,9 @@ from PySide6.QtWidgets import QApplication, QMessageBox, QPushButton, QWidget
 from .theme import ThemePalette
 
 
-def apply_dialog_theme(
-    widget: QWidget,
-    theme: ThemePalette,
-    *,
-    apply_titlebar_theme: Callable[[QWidget], None] | None = None,
-    button_setup: Callable[[QPushButton], None] | None = None,
-) -> None:
-    style = (
+@lru_cache(maxsize=8)
+def _dialog_stylesheet(theme: ThemePalette) -> str:
+    return (
         f"QDialog, QMessageBox {{ background: {theme.panel_bg}; color: {theme.text_primary}; }}"
         f"QLabel {{ color: {theme.text_primary}; background: transparent; }}"
         f"QCheckBox {{ color: {theme.text_primary}; background: transparent; }}"
@@ -25,26 +21,49 @@ def apply_dialog_theme(
         f"QPushButton:hover {{ background: {theme.accent}; color: {theme.text_primary}; }}"
         f"QPushButton:disabled {{ background: {theme.disabled_bg}; color: {theme.disabled_fg}; border-color: {theme.border}; }}"
     )
-    widget.setStyleSheet(style)
+
+
+@lru_cache(maxsize=8)
+def _dialog_palette_colors(theme: ThemePalette) -> tuple[tuple[QPalette.ColorGroup, QPalette.ColorRole, QColor], ...]:
+    panel_bg = QColor(theme.panel_bg)
+    text_primary = QColor(theme.text_primary)
+    disabled_fg = QColor(theme.disabled_fg)
+    return (
+        (QPalette.All, QPalette.Window, panel_bg),
+        (QPalette.All, QPalette.WindowText, text_primary),
+        (QPalette.All, QPalette.Base, QColor(theme.app_bg)),
+        (QPalette.All, QPalette.AlternateBase, panel_bg),
+        (QPalette.All, QPalette.Text, text_primary),
+        (QPalette.All, QPalette.Button, panel_bg),
+        (QPalette.All, QPalette.ButtonText, text_primary),
+        (QPalette.All, QPalette.ToolTipBase, panel_bg),
+        (QPalette.All, QPalette.ToolTipText, text_primary),
+        (QPalette.Disabled, QPalette.WindowText, disabled_fg),
+        (QPalette.Disabled, QPalette.Text, disabled_fg),
+        (QPalette.Disabled, QPalette.ButtonText, disabled_fg),
+        (QPalette.Disabled, QPalette.Button, QColor(theme.disabled_bg)),
+    )
+
+
+def apply_dialog_theme(
+    widget: QWidget,
+    theme: ThemePalette,
+    *,
+    apply_titlebar_theme: Callable[[QWidget], None] | None = None,
+    button_setup: Callable[[QPushButton], None] | None = None,
+    buttons: Sequence[QPushButton] | None = None,
+) -> None:
+    widget.setStyleSheet(_dialog_stylesheet(theme))
     palette = widget.palette()
-    palette.setColor(QPalette.Window, QColor(theme.panel_bg))
-    palette.setColor(QPalette.WindowText, QColor(theme.text_primary))
-    palette.setColor(QPalette.Base, QColor(theme.app_bg))
-    palette.setColor(QPalette.AlternateBase, QColor(theme.panel_bg))
-    palette.setColor(QPalette.Text, QColor(theme.text_primary))
-    palette.setColor(QPalette.Button, QColor(theme.panel_bg))
-    palette.setColor(QPalette.ButtonText, QColor(theme.text_primary))
-    palette.setColor(QPalette.ToolTipBase, QColor(theme.panel_bg))
-    palette.setColor(QPalette.ToolTipText, QColor(theme.text_primary))
-    palette.setColor(QPalette.Disabled, QPalette.WindowText, QColor(theme.disabled_fg))
-    palette.setColor(QPalette.Disabled, QPalette.Text, QColor(theme.disabled_fg))
-    palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(theme.disabled_fg))
-    palette.setColor(QPalette.Disabled, QPalette.Button, QColor(theme.disabled_bg))
+    for group, role, color in _dialog_palette_colors(theme):
+        palette.setColor(group, role, color)
     widget.setPalette(palette)
     widget.setAutoFillBackground(True)
     if apply_titlebar_theme is not None:
         apply_titlebar_theme(widget)
-    for button in widget.findChildren(QPushButton):
+    if buttons is None:
+        buttons = widget.findChildren(QPushButton)
+    for button in buttons:
         if button_setup is not None:
             button_setup(button)
         else:
@@ -80,6 +99,7 @@ def build_message_box(
         theme,
         apply_titlebar_theme=apply_titlebar_theme,
         button_setup=button_setup,
+        buttons=box.buttons(),
     )
     return box
 
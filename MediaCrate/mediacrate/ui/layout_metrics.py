@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
 
 def normalize_scale_factor(scale: float) -> float:
     try:
@@ -9,16 +13,19 @@ def normalize_scale_factor(scale: float) -> float:
     return max(0.1, min(8.0, parsed))
 
 
-def single_url_baseline_metrics(scale: float) -> dict[str, int]:
-    normalized_scale = normalize_scale_factor(scale)
+def single_url_baseline_metrics(scale: float) -> Mapping[str, int]:
+    return _single_url_baseline_metrics(normalize_scale_factor(scale))
+
 
+@lru_cache(maxsize=16)
+def _single_url_baseline_metrics(normalized_scale: float) -> Mapping[str, int]:
     def scaled(value: int, minimum: int) -> int:
         computed = int(round(value * normalized_scale))
         if normalized_scale < 1.0:
             return max(1, computed)
         return max(minimum, computed)
 
-    return {
+    return MappingProxyType({
         "progress_bar_height": scaled(24, 16),
         "features_left_margin": scaled(7, 5),
         "features_top_margin": scaled(4, 2),
@@ -41,4 +48,4 @@ def single_url_baseline_metrics(scale: float) -> dict[str, int]:
         "compact_delta": scaled(16, 16),
         "thumb_width_max": scaled(112, 70),
         "thumb_width_min": scaled(82, 50),
-    }
+    })
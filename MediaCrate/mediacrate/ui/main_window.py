@@ -5,7 +5,7 @@ import os
 import re
 from datetime import datetime
 from time import perf_counter
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 
 from PySide6.QtCore import (
@@ -78,7 +78,7 @@ from ..core.models import (
     DEFAULT_QUALITY_CHOICES,
     is_audio_format_choice,
 )
-from .batch_entry_presenter import batch_entry_render_signature
+from .batch_entry_presenter import batch_entry_render_signature, prune_batch_entry_view_cache
 from .dialogs import apply_dialog_theme, build_message_box, exec_dialog
 from .layout_metrics import (
     normalize_scale_factor as _normalize_scale_factor,
@@ -467,7 +467,7 @@ class MainWindow(QMainWindow):
             "card_spacing": self._scaled(6, scale, 4),
         }
 
-    def _single_url_layout_metrics(self, scale: float) -> dict[str, int]:
+    def _single_url_layout_metrics(self, scale: float) -> Mapping[str, int]:
         return _single_url_baseline_metrics(scale)
 
     def _apply_settings_control_heights(self, scale: float) -> None:
@@ -702,7 +702,7 @@ class MainWindow(QMainWindow):
         *,
         batch_mode_enabled: bool,
         console_margin_y: int,
-        single_metrics: dict[str, int],
+        single_metrics: Mapping[str, int],
     ) -> None:
         multi_entries_h = self._scaled(258, scale, 160) if batch_mode_enabled else self._scaled(220, scale, 130)
         self._multi_entries_scroll_default_height = multi_entries_h
@@ -729,7 +729,7 @@ class MainWindow(QMainWindow):
             self.console_card.setMaximumHeight(16777215)
         self.paste_button.setFixedWidth(self._scaled(88, scale, 76))
 
-    def _apply_single_layout_spacing_metrics(self, single_metrics: dict[str, int]) -> tuple[int, int, int]:
+    def _apply_single_layout_spacing_metrics(self, single_metrics: Mapping[str, int]) -> tuple[int, int, int]:
         self._single_features_layout.setContentsMargins(
             int(single_metrics["features_left_margin"]),
             int(single_metrics["features_top_margin"]),
@@ -755,7 +755,7 @@ class MainWindow(QMainWindow):
         for index, info_label in enumerate(self.single_meta_info_labels):
             info_label.setVisible(index < visible_info_lines)
 
-    def _single_combo_action_heights(self, single_metrics: dict[str, int]) -> tuple[int, int]:
+    def _single_combo_action_heights(self, single_metrics: Mapping[str, int]) -> tuple[int, int]:
         combo_height_bump = int(single_metrics["combo_height_bump"])
         button_height_bump = int(single_metrics["button_height_bump"])
         combo_h = max(self.format_combo.sizeHint().height(), self.quality_combo.sizeHint().height()) + combo_height_bump
@@ -766,7 +766,7 @@ class MainWindow(QMainWindow):
         self,
         scale: float,
         *,
-        single_metrics: dict[str, int],
+        single_metrics: Mapping[str, int],
         controls_row_h: int,
         visible_info_lines: int,
         status_h: int,
@@ -796,7 +796,7 @@ class MainWindow(QMainWindow):
         scale: float,
         *,
         batch_mode_enabled: bool,
-        single_metrics: dict[str, int],
+        single_metrics: Mapping[str, int],
         row_h: int,
         status_h: int,
         thumb_top_offset: int,
@@ -3543,6 +3543,7 @@ class MainWindow(QMainWindow):
             stale_widget.deleteLater()
             self._batch_entry_thumbnail_urls.pop(stale_id, None)
             self._batch_row_render_signatures.pop(stale_id, None)
+        prune_batch_entry_view_cache(entry_ids)
         if referenced_urls_before:
             referenced_urls_after = set(self._batch_entry_thumbnail_urls.values())
             for source_url in referenced_urls_before:
@@ -73,6 +73,10 @@ class DownloadWorker(BaseWorker):
             on_error=on_error,
         )
 
+    def stop(self) -> None:
+        super().stop()
+        self._service.wake_control_waiters()
+
     def pause_job(self, job_id: str) -> None:
         self._service.pause_job(str(job_id or "").strip())
 